@@ -1,9 +1,17 @@
+from bisect import bisect_left
 from typing import Tuple, List
 import os
 
 class AgentCompleter:
     def __init__(self, commands: List[str]) -> None:
         self.commands = commands
+        self._sorted_commands = sorted(commands)
+
+    def _commands_with_prefix(self, prefix: str) -> List[str]:
+        """Return commands starting with prefix, in sorted order, via bisect."""
+        lo = bisect_left(self._sorted_commands, prefix)
+        hi = bisect_left(self._sorted_commands, prefix + "\U0010ffff", lo)
+        return self._sorted_commands[lo:hi]
 
     def complete(self, buffer: str, cursor_pos: int) -> Tuple[str, List[str]]:
         """
@@ -22,7 +30,7 @@ class AgentCompleter:
         
         # If we're completing the first word, it's a command
         if len(words) == 1:
-            candidates = [cmd for cmd in self.commands if cmd.startswith(prefix)]
+            candidates = self._commands_with_prefix(prefix)
             if candidates:
                 # Replace the current word with the first candidate
                 new_buffer = buffer[:cursor_pos - len(current_word)] + candidates[0] + buffer[cursor_pos:]
@@ -73,7 +81,7 @@ class AgentCompleter:
         current_word = words[-1].lower()
         
         if len(words) == 1:
-            return [cmd for cmd in self.commands if cmd.startswith(current_word)]
+            return self._commands_with_prefix(current_word)
         else:
             # Path completion
             prefix = current_word
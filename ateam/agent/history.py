@@ -1,9 +1,9 @@
-import json
 import time
 from typing import List, Optional
 from ..mcp.contracts import Turn
 from ..util.types import Result, ErrorInfo
 from ..util.logging import log
+from ..util.jsonl import load_jsonl, append_jsonl, write_jsonl
 from .summarization import SummarizationEngine, SummarizationConfig, Summary
 
 class HistoryStore:
@@ -14,6 +14,11 @@ class HistoryStore:
         self._turns: List[Turn] = []
         self._summaries: List[dict] = []
         
+        # Memoized summaries/turns context sections; _epoch bumps on every mutation
+        self._epoch = 0
+        self._ctx_key: Optional[tuple] = None
+        self._ctx_parts: List[str] = []
+        
         # Initialize summarization engine
         if summarization_config:
             self.summarization_engine = SummarizationEngine(summarization_config)
@@ -25,40 +30,24 @@ class HistoryStore:
     def _load_existing(self) -> None:
         """Load existing history and summaries from JSONL files."""
         try:
-            import os
-            
             # Load history
-            if os.path.exists(self.history_path):
-                with open(self.history_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                turn = Turn(
-                                    ts=data["ts"],
-                                    role=data["role"],
-                                    source=data["source"],
-                                    content=data["content"],
-                                    tokens_in=data["tokens_in"],
-                                    tokens_out=data["tokens_out"],
-                                    tool_calls=data.get("tool_calls")
-                                )
-                                self._turns.append(turn)
-                            except Exception as e:
-                                log("WARN", "history", "parse_history_line_failed", error=str(e))
+            for data in load_jsonl(self.history_path, "history", "parse_history_line_failed"):
+                try:
+                    turn = Turn(
+                        ts=data["ts"],
+                        role=data["role"],
+                        source=data["source"],
+                        content=data["content"],
+                        tokens_in=data["tokens_in"],
+                        tokens_out=data["tokens_out"],
+                        tool_calls=data.get("tool_calls")
+                    )
+                    self._turns.append(turn)
+                except Exception as e:
+                    log("WARN", "history", "parse_history_line_failed", error=str(e))
             
             # Load summaries
-            if os.path.exists(self.summary_path):
-                with open(self.summary_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                self._summaries.append(data)
-                            except Exception as e:
-                                log("WARN", "history", "parse_summary_line_failed", error=str(e))
+            self._summaries.extend(load_jsonl(self.summary_path, "history", "parse_summary_line_failed"))
                                 
         except Exception as e:
             log("ERROR", "history", "load_failed", error=str(e))
@@ -67,6 +56,7 @@ class HistoryStore:
         """Append a turn to history."""
         try:
             self._turns.append(turn)
+            self._epoch += 1
             
             # Persist to file
             self._persist_turn(turn)
@@ -84,18 +74,16 @@ class HistoryStore:
             import os
             os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
             
-            with open(self.history_path, 'a', encoding='utf-8') as f:
-                data = {
-                    "ts": turn.ts,
-                    "role": turn.role,
-                    "source": turn.source,
-                    "content": turn.content,
-                    "tokens_in": turn.tokens_in,
-                    "tokens_out": turn.tokens_out,
-                    "tool_calls": turn.tool_calls
-                }
-                f.write(json.dumps(data) + '\n')
-                f.flush()  # Ensure immediate write
+            data = {
+                "ts": turn.ts,
+                "role": turn.role,
+                "source": turn.source,
+                "content": turn.content,
+                "tokens_in": turn.tokens_in,
+                "tokens_out": turn.tokens_out,
+                "tool_calls": turn.tool_calls
+            }
+            append_jsonl(self.history_path, data)
                 
         except Exception as e:
             log("ERROR", "history", "persist_turn_failed", error=str(e))
@@ -153,6 +141,7 @@ class HistoryStore:
                 self._turns.clear()
             
             self._summaries.append(legacy_summary)
+            self._epoch += 1
             self._persist_summary(legacy_summary)
             
             log("INFO", "history", "summarized", 
@@ -170,9 +159,7 @@ class HistoryStore:
             import os
             os.makedirs(os.path.dirname(self.summary_path), exist_ok=True)
             
-            with open(self.summary_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(summary) + '\n')
-                f.flush()  # Ensure immediate write
+            append_jsonl(self.summary_path, summary)
                 
         except Exception as e:
             log("ERROR", "history", "persist_summary_failed", error=str(e))
@@ -189,6 +176,7 @@ class HistoryStore:
         try:
             self._turns.clear()
             self._summaries.clear()
+            self._epoch += 1
             
             # Clear summarization engine if available
             if self.summarization_engine:
@@ -222,31 +210,21 @@ class HistoryStore:
             return self.summarization_engine.reconstruct_context(self._turns)
         else:
             # Fallback to simple context reconstruction
-            if not self._summaries and not self._turns:
+            context_parts = self._history_context_parts()
+            if not context_parts:
                 return "No conversation history available."
-            
-            context_parts = []
-            
-            # Add summaries
-            if self._summaries:
-                summary_text = "\n\n".join([
-                    f"Summary {i+1}: {summary['summary']}"
-                    for i, summary in enumerate(self._summaries)
-                ])
-                context_parts.append(f"Previous conversation summaries:\n{summary_text}")
-            
-            # Add recent turns
-            if self._turns:
-                recent_text = "\n\n".join([
-                    f"{turn.role.capitalize()}: {turn.content}"
-                    for turn in self._turns
-                ])
-                context_parts.append(f"Recent conversation:\n{recent_text}")
-            
             return "\n\n".join(context_parts)
     
-    def reconstruct_context_from_tail(self, tail_events: List[dict]) -> str:
-        """Reconstruct context from summaries and tail events on agent restart."""
+    def _history_context_parts(self) -> List[str]:
+        """Build the summaries and recent-turns sections of a reconstructed context.
+        
+        The result is reused until history changes; the key also covers list
+        identity and length so direct edits to _turns/_summaries are noticed.
+        """
+        key = (self._epoch, id(self._turns), len(self._turns), id(self._summaries), len(self._summaries))
+        if key == self._ctx_key:
+            return list(self._ctx_parts)
+        
         context_parts = []
         
         # Add summaries
@@ -257,7 +235,7 @@ class HistoryStore:
             ])
             context_parts.append(f"Previous conversation summaries:\n{summary_text}")
         
-        # Add recent turns from current history
+        # Add recent turns
         if self._turns:
             recent_text = "\n\n".join([
                 f"{turn.role.capitalize()}: {turn.content}"
@@ -265,6 +243,14 @@ class HistoryStore:
             ])
             context_parts.append(f"Recent conversation:\n{recent_text}")
         
+        self._ctx_key = key
+        self._ctx_parts = context_parts
+        return list(context_parts)
+    
+    def reconstruct_context_from_tail(self, tail_events: List[dict]) -> str:
+        """Reconstruct context from summaries and tail events on agent restart."""
+        context_parts = self._history_context_parts()
+        
         # Add tail events if provided
         if tail_events:
             tail_text = self._tail_events_to_text(tail_events)
@@ -339,6 +325,7 @@ class HistoryStore:
                 
                 # Replace all summaries with the compacted one
                 self._summaries = [combined_summary]
+                self._epoch += 1
                 
                 # Update the summary file
                 self._persist_compacted_summary(combined_summary)
@@ -360,9 +347,7 @@ class HistoryStore:
             os.makedirs(os.path.dirname(self.summary_path), exist_ok=True)
             
             # Write the single compacted summary
-            with open(self.summary_path, 'w', encoding='utf-8') as f:
-                f.write(json.dumps(summary) + '\n')
-                f.flush()
+            write_jsonl(self.summary_path, [summary])
                 
         except Exception as e:
             log("ERROR", "history", "persist_compacted_summary_failed", error=str(e))
@@ -8,11 +8,14 @@ from ..util.types import Result, ErrorInfo
 from ..util.logging import log
 
 class AgentIdentity:
-    def __init__(self, cwd: str, project_override: str = "", name_override: str = "", redis_url: str = None) -> None:
+    def __init__(self, cwd: str, project_override: str = "", name_override: str = "", redis_url: str = None,
+                 redis_pool=None) -> None:
         self.cwd = Path(cwd).resolve()
         self.project_override = project_override
         self.name_override = name_override
         self.redis_url = redis_url
+        # Optional caller-owned redis.asyncio.ConnectionPool to reuse instead of dialing redis_url
+        self.redis_pool = redis_pool
         self._computed_id: Optional[str] = None
         self._transport = None
         self._lock_session_id = str(uuid.uuid4())
@@ -89,7 +92,7 @@ class AgentIdentity:
         if not self._transport:
             try:
                 from ..mcp.redis_transport import RedisTransport
-                self._transport = RedisTransport(self.redis_url)
+                self._transport = RedisTransport(self.redis_url, pool=self.redis_pool)
                 result = await self._transport.connect()
                 if not result.ok:
                     return result
@@ -1,8 +1,13 @@
 import os
-from typing import Optional
+import time
+from typing import Optional, Tuple
 from ..util.types import Result, ErrorInfo
 from ..util.logging import log
 
+# A rewrite within the same timestamp tick may leave the signature unchanged,
+# so files modified this recently are always re-read
+_RECENT_MTIME_NS = 1_000_000_000
+
 class PromptLayer:
     def __init__(self, base_path: str, overlay_path: str) -> None:
         self.base_path = base_path
@@ -10,28 +15,50 @@ class PromptLayer:
         self._base_content: str = ""
         self._overlay_content: str = ""
         self._overlay_lines: list[str] = []
+        # (st_ino, st_mtime_ns, st_size) of each file as last read or written
+        self._base_sig: Optional[Tuple[int, int, int]] = None
+        self._overlay_sig: Optional[Tuple[int, int, int]] = None
         self._load_from_disk()
 
+    @staticmethod
+    def _file_sig(path: str) -> Optional[Tuple[int, int, int]]:
+        """Return a change signature for a file, or None if it doesn't exist."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _stale(sig: Tuple[int, int, int], cached: Optional[Tuple[int, int, int]]) -> bool:
+        """Whether a file must be re-read: its signature changed or it is too recent to trust."""
+        return sig != cached or time.time_ns() - sig[1] < _RECENT_MTIME_NS
+
     def _load_from_disk(self) -> None:
-        """Load base and overlay content from disk."""
+        """Load base and overlay content from disk, skipping files that haven't changed."""
         try:
             # Load base content
-            if os.path.exists(self.base_path):
-                with open(self.base_path, 'r', encoding='utf-8') as f:
-                    self._base_content = f.read()
-            else:
+            base_sig = self._file_sig(self.base_path)
+            if base_sig is None:
                 # Create default base content
                 self._base_content = "# System Prompt\n\nYou are a helpful AI assistant."
                 self._save_base()
+            elif self._stale(base_sig, self._base_sig):
+                with open(self.base_path, 'r', encoding='utf-8') as f:
+                    self._base_content = f.read()
+                self._base_sig = base_sig
             
             # Load overlay content
-            if os.path.exists(self.overlay_path):
+            overlay_sig = self._file_sig(self.overlay_path)
+            if overlay_sig is None:
+                self._overlay_content = ""
+                self._overlay_lines = []
+                self._overlay_sig = None
+            elif self._stale(overlay_sig, self._overlay_sig):
                 with open(self.overlay_path, 'r', encoding='utf-8') as f:
                     self._overlay_content = f.read()
                     self._overlay_lines = [line.strip() for line in self._overlay_content.split('\n') if line.strip()]
-            else:
-                self._overlay_content = ""
-                self._overlay_lines = []
+                self._overlay_sig = overlay_sig
                 
             log("DEBUG", "prompt", "loaded_from_disk", base_path=self.base_path, overlay_path=self.overlay_path)
             
@@ -44,7 +71,9 @@ class PromptLayer:
             os.makedirs(os.path.dirname(self.base_path), exist_ok=True)
             with open(self.base_path, 'w', encoding='utf-8') as f:
                 f.write(self._base_content)
+            self._base_sig = self._file_sig(self.base_path)
         except Exception as e:
+            self._base_sig = None
             log("ERROR", "prompt", "save_base_failed", error=str(e))
 
     def _save_overlay(self) -> None:
@@ -53,7 +82,9 @@ class PromptLayer:
             os.makedirs(os.path.dirname(self.overlay_path), exist_ok=True)
             with open(self.overlay_path, 'w', encoding='utf-8') as f:
                 f.write(self._overlay_content)
+            self._overlay_sig = self._file_sig(self.overlay_path)
         except Exception as e:
+            self._overlay_sig = None
             log("ERROR", "prompt", "save_overlay_failed", error=str(e))
 
     def effective(self) -> str:
@@ -1,10 +1,10 @@
-import json
 import time
 import uuid
 from typing import Optional, List
 from ..mcp.contracts import QueueItem
 from ..util.types import Result, ErrorInfo
 from ..util.logging import log
+from ..util.jsonl import load_jsonl, append_jsonl
 
 class PromptQueue:
     def __init__(self, path: str) -> None:
@@ -15,23 +15,17 @@ class PromptQueue:
     def _load_existing(self) -> None:
         """Load existing items from JSONL file."""
         try:
-            import os
-            if os.path.exists(self.path):
-                with open(self.path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                item = QueueItem(
-                                    id=data["id"],
-                                    text=data["text"],
-                                    source=data["source"],
-                                    ts=data["ts"]
-                                )
-                                self._items.append(item)
-                            except Exception as e:
-                                log("WARN", "queue", "parse_line_failed", error=str(e), line=line)
+            for data in load_jsonl(self.path, "queue", "parse_line_failed"):
+                try:
+                    item = QueueItem(
+                        id=data["id"],
+                        text=data["text"],
+                        source=data["source"],
+                        ts=data["ts"]
+                    )
+                    self._items.append(item)
+                except Exception as e:
+                    log("WARN", "queue", "parse_line_failed", error=str(e), line=str(data))
         except Exception as e:
             log("ERROR", "queue", "load_failed", error=str(e))
 
@@ -66,15 +60,13 @@ class PromptQueue:
             import os
             os.makedirs(os.path.dirname(self.path), exist_ok=True)
             
-            with open(self.path, 'a', encoding='utf-8') as f:
-                data = {
-                    "id": item.id,
-                    "text": item.text,
-                    "source": item.source,
-                    "ts": item.ts
-                }
-                f.write(json.dumps(data) + '\n')
-                f.flush()  # Ensure immediate write
+            data = {
+                "id": item.id,
+                "text": item.text,
+                "source": item.source,
+                "ts": item.ts
+            }
+            append_jsonl(self.path, data)
                 
         except Exception as e:
             log("ERROR", "queue", "persist_failed", error=str(e))
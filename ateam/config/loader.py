@@ -1,3 +1,6 @@
+import copy
+import functools
+import time
 import yaml
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
@@ -9,9 +12,26 @@ from .discovery import ConfigDiscovery
 from .merge import ConfigMerger
 from ..util.types import Result, ErrorInfo
 
+@functools.lru_cache(maxsize=128)
+def _parse_yaml(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file; the stat fields key the cache so edits invalidate it."""
+    return yaml.safe_load(Path(path).read_text())
+
 def load_yaml(path: Path) -> Dict[str, Any]:
-    """Load YAML file, return empty dict if file doesn't exist."""
-    return yaml.safe_load(path.read_text()) if path.exists() else {}
+    """Load YAML file, return empty dict if file doesn't exist.
+    
+    Parses are memoized per (path, mtime, size). A deep copy is returned
+    because ConfigMerger merges into the loaded dicts in place.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return {}
+    # An equal-size edit within the same timestamp tick would not change the
+    # key, so skip the cache for files modified in the last second
+    if time.time_ns() - st.st_mtime_ns < 1_000_000_000:
+        return _parse_yaml.__wrapped__(str(path), st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(_parse_yaml(str(path), st.st_mtime_ns, st.st_size))
 
 def load_stack(start_cwd: str) -> Result[Tuple[Optional[ProjectCfg], ModelsYaml, ToolsCfg, Dict[str, AgentCfg]]]:
     """Load and merge config from .ateam stack."""
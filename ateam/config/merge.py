@@ -26,34 +26,23 @@ class ConfigMerger:
         if not lists:
             return []
         
-        # Concatenate all lists (highest priority first)
-        combined = []
-        for lst in lists:
-            if lst:
-                combined.extend(lst)
-        
-        if not key:
-            # Naive de-dupe by value
-            seen = set()
-            result = []
-            for item in combined:
-                if item not in seen:
-                    seen.add(item)
-                    result.append(item)
-            return result
-        else:
-            # De-dupe by key
-            seen = set()
-            result = []
-            for item in combined:
-                if isinstance(item, dict) and key in item:
-                    item_key = item[key]
-                    if item_key not in seen:
-                        seen.add(item_key)
+        seen = set()
+        result = []
+        for lst in lists:  # Highest priority first
+            for item in lst or ():
+                if not key:
+                    # Naive de-dupe by value
+                    if item not in seen:
+                        seen.add(item)
+                        result.append(item)
+                elif isinstance(item, dict) and key in item:
+                    # De-dupe by key
+                    if item[key] not in seen:
+                        seen.add(item[key])
                         result.append(item)
                 else:
                     result.append(item)
-            return result
+        return result
 
     def _deep_merge(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
         """Recursively merge source into target."""
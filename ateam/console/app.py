@@ -2,7 +2,8 @@
 
 import asyncio
 import os
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
 from ..mcp.registry import MCPRegistryClient
 from ..mcp.ownership import OwnershipManager
@@ -32,6 +33,8 @@ class ConsoleApp:
         
         # Session management
         self._sessions: Dict[str, AgentSession] = {}
+        # Bumped on every attach/detach so completion caches can invalidate
+        self._sessions_version = 0
         self._running = False
         self._current_session: Optional[str] = None
     
@@ -131,6 +134,10 @@ class ConsoleApp:
             
         except Exception as e:
             log("ERROR", "console", "shutdown_error", error=str(e))
+        finally:
+            # Flush buffered console output last, after detach/cleanup notices
+            if self.ui:
+                self.ui.shutdown()
     
     async def attach_session(self, agent_id: str) -> Result[None]:
         """Attach to an agent session."""
@@ -145,6 +152,7 @@ class ConsoleApp:
                 return attach_result
             
             self._sessions[agent_id] = session
+            self._sessions_version += 1
             self._current_session = agent_id
             
             log("INFO", "console", "session_attached", agent_id=agent_id)
@@ -164,6 +172,7 @@ class ConsoleApp:
             await session.detach()
             
             del self._sessions[agent_id]
+            self._sessions_version += 1
             
             if self._current_session == agent_id:
                 self._current_session = None
@@ -181,6 +190,11 @@ class ConsoleApp:
             return self._sessions[self._current_session]
         return None
     
-    def list_sessions(self) -> Dict[str, AgentSession]:
-        """Get all active sessions."""
-        return self._sessions.copy()
+    @property
+    def sessions_version(self) -> int:
+        """Counter that changes whenever a session is attached or detached."""
+        return self._sessions_version
+    
+    def list_sessions(self) -> Mapping[str, AgentSession]:
+        """Get a read-only live view of all active sessions."""
+        return MappingProxyType(self._sessions)
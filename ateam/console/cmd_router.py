@@ -797,16 +797,27 @@ KB Commands:
                 model = status.get("model", "unknown")
                 cwd = status.get("cwd", "unknown")
                 
-                self.ui.print_output(f"Currently attached to: {agent_id}")
-                self.ui.print_output(f"  State: {state}")
-                self.ui.print_output(f"  Context: {ctx_pct:.1%}")
-                self.ui.print_output(f"  Model: {model}")
-                self.ui.print_output(f"  CWD: {cwd}")
-                self.ui.print_output(f"  Owner token: {owner_token[:8]}...")
+                lines = [
+                    f"Currently attached to: {agent_id}",
+                    f"  State: {state}",
+                    f"  Context: {ctx_pct:.1%}",
+                    f"  Model: {model}",
+                    f"  CWD: {cwd}",
+                    f"  Owner token: {owner_token[:8]}...",
+                ]
             else:
-                self.ui.print_output(f"Currently attached to: {agent_id}")
-                self.ui.print_output(f"  Status: Unable to retrieve (error: {status_result.error.message})")
-                self.ui.print_output(f"  Owner token: {owner_token[:8]}...")
+                lines = [
+                    f"Currently attached to: {agent_id}",
+                    f"  Status: Unable to retrieve (error: {status_result.error.message})",
+                    f"  Owner token: {owner_token[:8]}...",
+                ]
+            
+            if self.ui.is_tty():
+                for line in lines:
+                    self.ui.print_output(line)
+            else:
+                # Redirected output: same text in a single write
+                self.ui.print_output("\n".join(lines))
                 
         except Exception as e:
             log("ERROR", "router", "who_error", error=str(e))
@@ -1,12 +1,42 @@
 """Console command completion with commands, agent IDs, and path completion."""
 
+import functools
 import os
-from typing import List, Optional
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
 
 from prompt_toolkit.completion import Completion
 
 from ..util.logging import log
 
+# Seconds an identical completion request is answered from the last result
+COMPLETION_CACHE_TTL = 0.2
+
+
+@functools.lru_cache(maxsize=64)
+def _scan_dir(directory: str, mtime_ns: int) -> Tuple[Tuple[str, bool], ...]:
+    """List (name, is_dir) entries; mtime_ns keys the cache so changes invalidate it."""
+    with os.scandir(directory) as it:
+        return tuple((entry.name, entry.is_dir()) for entry in it)
+
+
+def _list_dir(directory: str) -> Tuple[Tuple[str, bool], ...]:
+    """List a directory, reusing the cached scan unless its mtime is too recent to trust."""
+    mtime_ns = os.stat(directory).st_mtime_ns
+    # A change within the same timestamp tick would not move mtime, so skip
+    # the cache for directories modified in the last second
+    if time.time_ns() - mtime_ns < 1_000_000_000:
+        return _scan_dir.__wrapped__(directory, mtime_ns)
+    return _scan_dir(os.path.abspath(directory), mtime_ns)
+
+
+def _with_prefix(sorted_items: List[str], prefix: str) -> List[str]:
+    """Return items starting with prefix, in sorted order, via bisect."""
+    lo = bisect_left(sorted_items, prefix)
+    hi = bisect_left(sorted_items, prefix + "\U0010ffff", lo)
+    return sorted_items[lo:hi]
+
 
 class ConsoleCompleter:
     """Console completer with commands, agent IDs, and path completion."""
@@ -48,10 +78,34 @@ class ConsoleCompleter:
             "/ui": ["toggle", "panes"],
             "/agent": ["new", "list", "delete"],
         }
+        
+        # Sorted views for prefix lookups
+        self._sorted_commands = sorted(self.commands)
+        self._sorted_subcommands: Dict[str, List[str]] = {
+            cmd: sorted(subs) for cmd, subs in self.subcommands.items()
+        }
+        
+        # Last (text, cwd, sessions version) request, when it was made, and what it produced
+        self._last_key: Optional[Tuple[str, str, int]] = None
+        self._last_time = 0.0
+        self._last_completions: List[Completion] = []
     
     def get_completions(self, document, complete_event):
-        """Get completions for the current document."""
-        text = document.text_before_cursor
+        """Get completions, reusing the last result for a repeated request within the TTL.
+        
+        Attaching or detaching a session bumps the app's sessions version,
+        which invalidates the cached result.
+        """
+        key = (document.text_before_cursor, os.getcwd(), self.app.sessions_version)
+        now = time.monotonic()
+        if key != self._last_key or now - self._last_time >= COMPLETION_CACHE_TTL:
+            self._last_completions = list(self._compute_completions(key[0]))
+            self._last_key = key
+            self._last_time = now
+        yield from self._last_completions
+    
+    def _compute_completions(self, text: str):
+        """Compute completions for the text before the cursor."""
         words = text.split()
         
         if not words:
@@ -86,28 +140,26 @@ class ConsoleCompleter:
         # Handle command completion
         if len(words) == 1:
             # First word - complete commands
-            for cmd, desc in self.commands.items():
-                if cmd.startswith(current_word):
-                    yield Completion(
-                        cmd, 
-                        start_position=-len(current_word), 
-                        display=cmd, 
-                        display_meta=desc
-                    )
+            for cmd in _with_prefix(self._sorted_commands, current_word):
+                yield Completion(
+                    cmd, 
+                    start_position=-len(current_word), 
+                    display=cmd, 
+                    display_meta=self.commands[cmd]
+                )
             return
         
         # Handle subcommand completion
         if len(words) == 2 and words[0] in self.subcommands:
             base_cmd = words[0]
-            subcommands = self.subcommands[base_cmd]
+            subcommands = self._sorted_subcommands[base_cmd]
             
-            for subcmd in subcommands:
-                if subcmd.startswith(current_word):
-                    yield Completion(
-                        subcmd,
-                        start_position=-len(current_word),
-                        display=subcmd
-                    )
+            for subcmd in _with_prefix(subcommands, current_word):
+                yield Completion(
+                    subcmd,
+                    start_position=-len(current_word),
+                    display=subcmd
+                )
             return
         
         # Handle agent ID completion for /attach, /detach, and /agent delete
@@ -228,16 +280,14 @@ class ConsoleCompleter:
             if not os.path.exists(directory):
                 return
             
-            # List directory contents
+            # List directory contents (cached until the directory changes)
             try:
-                items = os.listdir(directory)
+                entries = _list_dir(directory)
                 
-                for item in items:
+                for item, is_dir in entries:
                     if item.startswith(prefix):
-                        full_path = os.path.join(directory, item)
-                        
                         # Add trailing slash for directories
-                        if os.path.isdir(full_path):
+                        if is_dir:
                             display = item + ("\\" if os.name == 'nt' else "/")
                         else:
                             display = item
@@ -1,6 +1,9 @@
 """Console UI with prompt-toolkit interface and rich input handling."""
 
+import os
+import queue
 import sys
+import threading
 from typing import Optional, List
 
 from prompt_toolkit import PromptSession
@@ -9,6 +12,60 @@ from prompt_toolkit.keys import Keys
 
 from ..util.logging import log
 
+# Max characters the background writer joins into one stdout write
+CONSOLE_BUFFER_SIZE = 8000
+
+# One template per /ps row and per status block, applied with a single %
+_AGENT_ROW_TMPL = "  %s\n    Status: %s\n    Model: %s\n    CWD: %s\n"
+_SESSION_STATUS_TMPL = (
+    "\nCurrent Session:\n"
+    "================\n"
+    "Agent: %s\n"
+    "Status: %s\n"
+    "Model: %s\n"
+    "CWD: %s\n"
+    "Context: %.1f%%\n"
+)
+
+# Static /help text, built once at import
+_HELP_TEXT = """
+ATeam Console - Available Commands:
+===================================
+
+Navigation:
+  /ps                    - List running agents
+  /attach <agent>        - Attach to an agent
+  /detach                - Detach from current agent
+  /quit                  - Exit console
+
+Agent Interaction:
+  /input <text>          - Send input to agent
+  /ctx                   - Show context usage
+  /who                   - Show ownership status
+
+System Management:
+  /sys show              - Show system prompt
+  /reloadsysprompt       - Reload system prompt
+  # <text>               - Append to prompt overlay
+
+Knowledge Base:
+  /kb add --scope <s> <path>  - Add documents to KB
+  /kb search --scope <s> <q>  - Search KB
+  /kb copy-from <agent> --ids <ids>  - Copy from agent
+
+Agent Management:
+  /agent new             - Create new agent
+  /offload               - Offload to new agent
+  /clearhistory          - Clear conversation history
+
+UI:
+  /ui panes on|off       - Toggle panes UI
+  F1                     - Show this help
+  F2                     - Toggle panes mode
+  TAB                    - Command completion
+
+"""
+
 
 class ConsoleUI:
     """Console UI with prompt-toolkit interface and rich input handling."""
@@ -23,6 +80,74 @@ class ConsoleUI:
         self.app = None  # Will be set by ConsoleApp
         self._takeover_banner_active = False
         self._read_only_banner_active = False
+        
+        # Opt-in background writer (ATEAM_CONSOLE_BUFFER=1) keeps stdout writes
+        # off the event loop; off by default since routers still print directly
+        self._out_q: Optional[queue.SimpleQueue] = None
+        self._writer: Optional[threading.Thread] = None
+        if os.environ.get("ATEAM_CONSOLE_BUFFER", "0") == "1":
+            self._out_q = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._writer_loop, name="console-writer", daemon=True)
+            self._writer.start()
+    
+    def _writer_loop(self) -> None:
+        """Drain queued output into batched stdout writes."""
+        q = self._out_q
+        pending: Optional[object] = None
+        while True:
+            item = pending if pending is not None else q.get()
+            pending = None
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            
+            chunks = [item]
+            size = len(item)
+            while size < CONSOLE_BUFFER_SIZE:
+                try:
+                    nxt = q.get_nowait()
+                except queue.Empty:
+                    break
+                if not isinstance(nxt, str):
+                    pending = nxt
+                    break
+                chunks.append(nxt)
+                size += len(nxt)
+            
+            try:
+                sys.stdout.write("".join(chunks))
+                sys.stdout.flush()
+            except Exception as e:
+                log("ERROR", "ui", "write_failed", error=str(e))
+    
+    def _emit(self, text: str) -> None:
+        """Write text to stdout, via the background writer when enabled."""
+        if self._out_q is not None:
+            self._out_q.put_nowait(text)
+            return
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    
+    def flush_sync(self, timeout: float = 5.0) -> None:
+        """Block until all queued output has been written."""
+        if self._out_q is None or not self._writer or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._out_q.put_nowait(done)
+        done.wait(timeout)
+    
+    def shutdown(self) -> None:
+        """Flush queued output and stop the background writer."""
+        if self._out_q is None or not self._writer:
+            return
+        self.flush_sync()
+        self._out_q.put_nowait(None)
+        self._writer.join(timeout=5.0)
+        self._writer = None
+        # Later output is written directly instead of queued for a dead writer
+        self._out_q = None
     
     def _setup_key_bindings(self) -> KeyBindings:
         """Setup key bindings for the console."""
@@ -95,6 +220,7 @@ class ConsoleUI:
             return self.panes.read_command()
         
         # Fallback to prompt-toolkit or basic input
+        self.flush_sync()
         try:
             if self.prompt_session:
                 return self.prompt_session.prompt("ateam> ").strip()
@@ -111,6 +237,7 @@ class ConsoleUI:
     
     def input(self, prompt: str) -> str:
         """Read input with a custom prompt."""
+        self.flush_sync()
         try:
             if self.prompt_session:
                 return self.prompt_session.prompt(prompt).strip()
@@ -139,7 +266,7 @@ class ConsoleUI:
             "success": "[OK]"
         }
         prefix = prefix_map.get(level, "[INFO]")
-        print(f"{prefix} {message}")
+        self._emit(f"{prefix} {message}\n")
     
     def print_error(self, message: str) -> None:
         """Print an error message."""
@@ -147,43 +274,7 @@ class ConsoleUI:
     
     def print_help(self) -> None:
         """Print help information."""
-        help_text = """
-ATeam Console - Available Commands:
-===================================
-
-Navigation:
-  /ps                    - List running agents
-  /attach <agent>        - Attach to an agent
-  /detach                - Detach from current agent
-  /quit                  - Exit console
-
-Agent Interaction:
-  /input <text>          - Send input to agent
-  /ctx                   - Show context usage
-  /who                   - Show ownership status
-
-System Management:
-  /sys show              - Show system prompt
-  /reloadsysprompt       - Reload system prompt
-  # <text>               - Append to prompt overlay
-
-Knowledge Base:
-  /kb add --scope <s> <path>  - Add documents to KB
-  /kb search --scope <s> <q>  - Search KB
-  /kb copy-from <agent> --ids <ids>  - Copy from agent
-
-Agent Management:
-  /agent new             - Create new agent
-  /offload               - Offload to new agent
-  /clearhistory          - Clear conversation history
-
-UI:
-  /ui panes on|off       - Toggle panes UI
-  F1                     - Show this help
-  F2                     - Toggle panes mode
-  TAB                    - Command completion
-"""
-        print(help_text)
+        self._emit(_HELP_TEXT)
         
         # Only wait for input if not in a test environment
         try:
@@ -191,6 +282,7 @@ UI:
             if hasattr(sys, '_called_main') and not sys._called_main:
                 # We're in a test environment, don't wait for input
                 return
+            self.flush_sync()
             input("Press any key to continue...")
         except (KeyboardInterrupt, EOFError, OSError):
             # Handle cases where input is not available
@@ -212,7 +304,7 @@ UI:
 ║  Use /detach to disconnect or wait for the other console to release.       ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
-        print(banner_text)
+        self._emit(banner_text + "\n")
     
     def hide_takeover_banner(self) -> None:
         """Hide the takeover banner."""
@@ -232,7 +324,7 @@ UI:
 ║  Use /detach to disconnect or /attach --takeover to force takeover.         ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
-        print(banner_text)
+        self._emit(banner_text + "\n")
     
     def hide_read_only_banner(self) -> None:
         """Hide the read-only banner."""
@@ -249,44 +341,44 @@ UI:
     def print_output(self, text: str, prefix: str = "") -> None:
         """Print output text."""
         if prefix:
-            print(f"{prefix} {text}")
+            self._emit(f"{prefix} {text}\n")
         else:
-            print(text)
+            self._emit(f"{text}\n")
+    
+    def _write_block(self, lines: List[str]) -> None:
+        """Write a multi-line block to stdout in a single write."""
+        self._emit("\n".join(lines) + "\n")
     
     def print_agents_list(self, agents: List[dict]) -> None:
         """Print a list of agents."""
         if not agents:
-            print("No agents found.")
+            self._emit("No agents found.\n")
             return
         
-        print("\nAvailable Agents:")
-        print("=================")
-        
-        for agent in agents:
-            status = agent.get("state", "unknown")
-            model = agent.get("model", "unknown")
-            cwd = agent.get("cwd", "unknown")
-            
-            print(f"  {agent['id']}")
-            print(f"    Status: {status}")
-            print(f"    Model: {model}")
-            print(f"    CWD: {cwd}")
-            print()
+        rows = [
+            _AGENT_ROW_TMPL % (
+                agent["id"],
+                agent.get("state", "unknown"),
+                agent.get("model", "unknown"),
+                agent.get("cwd", "unknown"),
+            )
+            for agent in agents
+        ]
+        self._write_block(["", "Available Agents:", "=================", "\n".join(rows)])
     
     def print_session_status(self, session_info: dict) -> None:
         """Print current session status."""
-        print("\nCurrent Session:")
-        print("================")
-        print(f"Agent: {session_info.get('agent_id', 'none')}")
-        print(f"Status: {session_info.get('status', 'unknown')}")
-        print(f"Model: {session_info.get('model', 'unknown')}")
-        print(f"CWD: {session_info.get('cwd', 'unknown')}")
-        print(f"Context: {session_info.get('ctx_pct', 0):.1f}%")
-        print()
+        self._emit(_SESSION_STATUS_TMPL % (
+            session_info.get('agent_id', 'none'),
+            session_info.get('status', 'unknown'),
+            session_info.get('model', 'unknown'),
+            session_info.get('cwd', 'unknown'),
+            session_info.get('ctx_pct', 0),
+        ) + "\n")
     
     def clear_screen(self) -> None:
         """Clear the screen."""
-        print("\033[2J\033[H", end="")
+        self._emit("\033[2J\033[H")
     
     def is_tty(self) -> bool:
         """Check if running in a TTY."""
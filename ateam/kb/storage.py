@@ -9,6 +9,13 @@ from pathlib import Path
 
 from ..util.logging import log
 
+# Optional C-accelerated JSON for collection load/save
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class KBStorage:
     """Simple in-memory KB storage with JSON persistence."""
@@ -17,6 +24,8 @@ class KBStorage:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self._collections: Dict[str, Dict[str, Any]] = {}
+        # collection_id -> content_hash -> item_id, built lazily per collection
+        self._hash_index: Dict[str, Dict[str, str]] = {}
         self._id_counter = 0
         self._load_collections()
     
@@ -29,8 +38,11 @@ class KBStorage:
         for json_file in self.base_dir.glob("*.json"):
             collection_id = json_file.stem
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    self._collections[collection_id] = json.load(f)
+                if ORJSON_AVAILABLE:
+                    self._collections[collection_id] = orjson.loads(json_file.read_bytes())
+                else:
+                    with open(json_file, 'r', encoding='utf-8') as f:
+                        self._collections[collection_id] = json.load(f)
                 log("DEBUG", "kb_storage", "loaded_collection", collection_id=collection_id)
             except Exception as e:
                 log("ERROR", "kb_storage", "load_failed", collection_id=collection_id, error=str(e))
@@ -39,8 +51,13 @@ class KBStorage:
         """Save collection to disk."""
         collection_path = self._get_collection_path(collection_id)
         try:
-            with open(collection_path, 'w', encoding='utf-8') as f:
-                json.dump(self._collections[collection_id], f, indent=2)
+            if ORJSON_AVAILABLE:
+                collection_path.write_bytes(
+                    orjson.dumps(self._collections[collection_id], option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                )
+            else:
+                with open(collection_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._collections[collection_id], f, indent=2)
             log("DEBUG", "kb_storage", "saved_collection", collection_id=collection_id)
         except Exception as e:
             log("ERROR", "kb_storage", "save_failed", collection_id=collection_id, error=str(e))
@@ -51,6 +68,18 @@ class KBStorage:
         if collection_id not in self._collections:
             self._collections[collection_id] = {"items": {}, "metadata": {}}
     
+    def _get_hash_index(self, collection_id: str) -> Dict[str, str]:
+        """Get the content-hash index for a collection, building it on first use."""
+        index = self._hash_index.get(collection_id)
+        if index is None:
+            index = {}
+            for item_id, item in self._collections[collection_id]["items"].items():
+                content_hash = item.get("content_hash")
+                if content_hash is not None:
+                    index.setdefault(content_hash, item_id)
+            self._hash_index[collection_id] = index
+        return index
+    
     def _compute_content_hash(self, content: str) -> str:
         """Compute hash for content deduplication."""
         return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
@@ -64,10 +93,11 @@ class KBStorage:
         content_hash = self._compute_content_hash(content)
         
         # Check for duplicates
-        for item_id, item in self._collections[collection_id]["items"].items():
-            if item.get("content_hash") == content_hash:
-                log("DEBUG", "kb_storage", "duplicate_found", collection_id=collection_id, item_id=item_id)
-                return [item_id]
+        index = self._get_hash_index(collection_id)
+        if content_hash in index:
+            item_id = index[content_hash]
+            log("DEBUG", "kb_storage", "duplicate_found", collection_id=collection_id, item_id=item_id)
+            return [item_id]
         
         # Add new item
         self._id_counter += 1
@@ -84,6 +114,7 @@ class KBStorage:
         }
         
         self._collections[collection_id]["items"][item_id] = item_data
+        index[content_hash] = item_id
         self._save_collection(collection_id)
         
         log("INFO", "kb_storage", "item_added", collection_id=collection_id, item_id=item_id)
@@ -126,6 +157,7 @@ class KBStorage:
         self._ensure_collection(collection_id)
         if item_id in self._collections[collection_id]["items"]:
             del self._collections[collection_id]["items"][item_id]
+            self._hash_index.pop(collection_id, None)
             self._save_collection(collection_id)
             log("INFO", "kb_storage", "item_deleted", collection_id=collection_id, item_id=item_id)
             return True
@@ -138,6 +170,7 @@ class KBStorage:
         
         self._ensure_collection(source_collection)
         self._ensure_collection(target_collection)
+        target_index = self._get_hash_index(target_collection)
         
         for item_id in item_ids:
             item = self._collections[source_collection]["items"].get(item_id)
@@ -147,14 +180,9 @@ class KBStorage:
             
             # Check for duplicates in target
             content_hash = item.get("content_hash")
-            duplicate_found = False
-            for target_item in self._collections[target_collection]["items"].values():
-                if target_item.get("content_hash") == content_hash:
-                    skipped.append(item_id)
-                    duplicate_found = True
-                    break
-            
-            if not duplicate_found:
+            if content_hash in target_index:
+                skipped.append(item_id)
+            else:
                 # Copy item with new ID
                 import time
                 self._id_counter += 1
@@ -166,6 +194,8 @@ class KBStorage:
                     "copied_at": datetime.now().isoformat()
                 }
                 self._collections[target_collection]["items"][new_item_id] = new_item
+                if content_hash is not None:
+                    target_index[content_hash] = new_item_id
                 copied.append(new_item_id)
         
         if copied:
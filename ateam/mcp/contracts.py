@@ -1,6 +1,10 @@
+import sys
 from dataclasses import dataclass
 from typing import Literal, Optional, List, Dict, Any, Tuple
 
+# dataclass(slots=True) needs Python 3.10+
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 AgentId = str  # "project/agent"
 DocId = str
 Scope = Literal["agent", "project", "user"]
@@ -39,7 +43,7 @@ class QueueItem:
     source: Literal["console", "local"]
     ts: float
 
-@dataclass
+@dataclass(**_SLOTS)
 class Turn:
     ts: float
     role: Literal["user", "assistant", "tool"]
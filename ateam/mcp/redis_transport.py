@@ -10,9 +10,12 @@ from ..util.const import DEFAULTS
 from ..util.logging import log
 
 class RedisTransport:
-    def __init__(self, url: str, username: str = "", password: str = "", tls: bool = False, config=None) -> None:
+    def __init__(self, url: str, username: str = "", password: str = "", tls: bool = False, config=None,
+                 pool: Optional[ConnectionPool] = None) -> None:
         self.url = url
         self.config = config
+        # Caller-owned pool to share connections across transports; never disconnected here
+        self._shared_pool = pool
         
         # Legacy parameters (for backward compatibility)
         self.username = username
@@ -108,7 +111,10 @@ class RedisTransport:
                 if self.tls:
                     conn_params["ssl"] = True
                 
-            self._pool = ConnectionPool(**conn_params)
+            if self._shared_pool is not None:
+                self._pool = self._shared_pool
+            else:
+                self._pool = ConnectionPool(**conn_params)
             self._redis = Redis(connection_pool=self._pool)
             await self._redis.ping()
             self._running = True
@@ -122,7 +128,7 @@ class RedisTransport:
             self._running = False
             if self._redis:
                 await self._redis.aclose()
-            if self._pool:
+            if self._pool and self._pool is not self._shared_pool:
                 await self._pool.disconnect()
             return Result(ok=True)
         except Exception as e:
@@ -0,0 +1,100 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+from .logging import log
+
+# Optional C-accelerated JSON for the per-line hot path
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+else:
+    _loads = json.loads
+    _dumps = json.dumps
+
+_CACHE_MAX_ENTRIES = 100
+
+# A rewrite within the same timestamp tick may leave mtime and size unchanged,
+# so files modified this recently are always re-read
+_RECENT_MTIME_NS = 1_000_000_000
+
+# abspath -> (st_mtime_ns, st_size, valid raw lines); LRU ordered, oldest first.
+# Raw lines are immutable, and re-parsing them is cheaper than deep-copying dicts.
+_cache: "OrderedDict[str, Tuple[int, int, Tuple[str, ...]]]" = OrderedDict()
+
+def _store(key: str, st: os.stat_result, lines: Tuple[str, ...]) -> None:
+    _cache[key] = (st.st_mtime_ns, st.st_size, lines)
+    _cache.move_to_end(key)
+    while len(_cache) > _CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+def _recent(st: os.stat_result) -> bool:
+    return time.time_ns() - st.st_mtime_ns < _RECENT_MTIME_NS
+
+def _fresh(key: str, st: os.stat_result) -> bool:
+    if _recent(st):
+        return False
+    cached = _cache.get(key)
+    return cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size
+
+def load_jsonl(path: str, where: str, event: str) -> List[Dict[str, Any]]:
+    """Parse a JSONL file, reusing the previous read while mtime and size are unchanged.
+
+    Files modified within the last second are always re-read and not cached.
+
+    Malformed lines are logged as WARN `event` under `where` and skipped.
+    Records are freshly parsed on every call, so callers may mutate them freely.
+    """
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(key)
+    except FileNotFoundError:
+        _cache.pop(key, None)
+        return []
+
+    if _fresh(key, st):
+        _cache.move_to_end(key)
+        return [_loads(line) for line in _cache[key][2]]
+
+    records: List[Dict[str, Any]] = []
+    valid: List[str] = []
+    with open(key, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(_loads(line))
+                    valid.append(line)
+                except Exception as e:
+                    log("WARN", where, event, error=str(e), line=line)
+
+    if _recent(st):
+        _cache.pop(key, None)
+    else:
+        _store(key, st, tuple(valid))
+    return records
+
+def append_jsonl(path: str, record: Dict[str, Any]) -> None:
+    """Append one record and drop any cached parse of the file."""
+    key = os.path.abspath(path)
+    with open(key, 'a', encoding='utf-8') as f:
+        f.write(_dumps(record) + '\n')
+        f.flush()  # Ensure immediate write
+    _cache.pop(key, None)
+
+def write_jsonl(path: str, records: List[Dict[str, Any]]) -> None:
+    """Replace the file with `records` and drop any cached parse of it."""
+    key = os.path.abspath(path)
+    with open(key, 'w', encoding='utf-8') as f:
+        f.write(''.join(_dumps(record) + '\n' for record in records))
+        f.flush()
+    _cache.pop(key, None)
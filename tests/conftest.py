@@ -1,23 +1,56 @@
 """Pytest configuration for ATeam tests."""
 
+import asyncio
+import os
 import pytest
 import pytest_asyncio
+from pytest_asyncio import is_async_test
+import re
+import socket
 import subprocess
+import tempfile
 import time
 
+# Optional faster event loop for async tests
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Optional in-process Redis for unit-level lock tests
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
 
 class RedisTestManager:
-    """Manages Redis Docker container for tests."""
+    """Manages Redis Docker container for tests.
     
-    def __init__(self):
+    Under pytest-xdist each worker gets its own container and port
+    (gw0 -> 6379, gw1 -> 6380, ...) so workers never share Redis state.
+    """
+    
+    def __init__(self, worker_id: str = ""):
         self.container_name = "redis-ateam-pytests"
         self.port = 6379
+        if worker_id:
+            self.container_name = f"{self.container_name}-{worker_id}"
+            self.port += int(worker_id[2:])
         self.redis_url = f"redis://localhost:{self.port}"
     
     def start_redis(self):
-        """Start Redis container."""
+        """Start Redis container, reusing a healthy one from a previous run."""
         try:
-            # First, ensure any existing container is cleaned up
+            if self.is_running() and self.ping(timeout=0.2):
+                # Drop state left behind by the previous session
+                self.flush_all()
+                print(f"Reusing Redis container '{self.container_name}'")
+                return True
+            
+            # Ensure any stale container is cleaned up
             self.stop_redis()
             
             # Create and start new container
@@ -29,79 +62,144 @@ class RedisTestManager:
                 "redis-server", "--save", "", "--appendonly", "no"
             ], check=True)
             
-            # Wait for Redis to be ready
-            time.sleep(3)
-            
-            # Test connection with retries
-            max_retries = 5
-            for attempt in range(max_retries):
-                try:
-                    result = subprocess.run([
-                        "docker", "exec", self.container_name,
-                        "redis-cli", "ping"
-                    ], capture_output=True, text=True, timeout=10)
-                    
-                    if "PONG" in result.stdout:
-                        print(f"Redis container '{self.container_name}' started successfully")
-                        return True
-                    else:
-                        print(f"Redis ping failed (attempt {attempt + 1}/{max_retries})")
-                        
-                except subprocess.TimeoutExpired:
-                    print(f"Redis ping timeout (attempt {attempt + 1}/{max_retries})")
-                
-                if attempt < max_retries - 1:
-                    time.sleep(2)
+            if self.wait_ready():
+                print(f"Redis container '{self.container_name}' started successfully")
+                return True
             
             raise Exception("Redis not responding to ping after multiple attempts")
                 
         except subprocess.CalledProcessError as e:
             raise Exception(f"Failed to start Redis: {e}")
     
-    def stop_redis(self):
-        """Stop and remove Redis container."""
+    def is_running(self):
+        """Check whether the test container exists and is running."""
         try:
-            # Check if container exists
             result = subprocess.run(
-                ["docker", "ps", "-a", "--filter", f"name={self.container_name}"],
-                capture_output=True, text=True
+                ["docker", "inspect", "-f", "{{.State.Running}}", self.container_name],
+                capture_output=True, text=True, timeout=10
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        return result.returncode == 0 and result.stdout.strip() == "true"
+    
+    def ping(self, timeout=0.05):
+        """Send a RESP PING straight to the mapped port."""
+        try:
+            with socket.create_connection(("127.0.0.1", self.port), timeout=timeout) as sock:
+                sock.sendall(b"*1\r\n$4\r\nPING\r\n")
+                return sock.recv(16).startswith(b"+PONG")
+        except OSError:
+            return False
+    
+    def wait_ready(self, timeout=5.0):
+        """Poll PING every 25ms until Redis answers or the timeout expires."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.ping():
+                return True
+            time.sleep(0.025)
+        return False
+    
+    def flush_all(self, timeout=10):
+        """Flush all Redis data inside the container."""
+        result = subprocess.run([
+            "docker", "exec", self.container_name,
+            "redis-cli", "flushall"
+        ], capture_output=True, text=True, timeout=timeout)
+        if "OK" not in result.stdout:
+            raise Exception("Redis FLUSHALL failed on reused container")
+    
+    def stop_redis(self):
+        """Stop and remove Redis container (no-op if it does not exist)."""
+        try:
+            subprocess.run(
+                ["docker", "rm", "-f", self.container_name],
+                capture_output=True, timeout=10, check=False
             )
-            
-            if self.container_name in result.stdout:
-                # Stop container
-                subprocess.run(
-                    ["docker", "stop", self.container_name],
-                    capture_output=True, timeout=10
-                )
-                
-                # Remove container
-                subprocess.run(
-                    ["docker", "rm", self.container_name],
-                    capture_output=True, timeout=10
-                )
-                
-                print(f"Redis container '{self.container_name}' stopped and removed")
-            else:
-                print(f"Redis container '{self.container_name}' not found")
-                
         except Exception as e:
             print(f"Warning: Error during Redis cleanup: {e}")
-            # Try force removal as last resort
-            try:
-                subprocess.run(
-                    ["docker", "rm", "-f", self.container_name],
-                    capture_output=True, timeout=5
-                )
-            except Exception:
-                pass
 
 
-# Global Redis manager
-redis_manager = RedisTestManager()
+def keep_redis():
+    """Whether to leave the Redis container running for the next session.
+    
+    Controlled by ATEAM_TESTS_KEEP_REDIS; defaults to keeping it locally and
+    tearing it down on CI.
+    """
+    default = "0" if os.environ.get("CI") else "1"
+    return os.environ.get("ATEAM_TESTS_KEEP_REDIS", default) != "0"
+
+
+def use_tmpfs_tempdir():
+    """Point tempfile (and so tmp_path) at /dev/shm when ATEAM_TESTS_TMPFS=1.
+    
+    KB, queue and history tests are small-file write bound and run faster on
+    tmpfs. Off by default; if /dev/shm is missing or not writable the normal
+    temp dir is kept.
+    """
+    if os.environ.get("ATEAM_TESTS_TMPFS", "0") != "1":
+        return
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        tempfile.tempdir = "/dev/shm"
+    else:
+        print("ATEAM_TESTS_TMPFS=1 but /dev/shm is not writable; using the default temp dir")
+
+
+# Global Redis manager (per xdist worker when sharding)
+redis_manager = RedisTestManager(os.environ.get("PYTEST_XDIST_WORKER", ""))
+
+
+def _is_xdist_controller(config):
+    """True for the xdist controller process, which runs no tests itself."""
+    return config.getoption("dist", "no") != "no" and not hasattr(config, "workerinput")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """Shard by file across pytest-xdist workers when ATEAM_TESTS_WORKERS is set.
+    
+    ``ATEAM_TESTS_WORKERS=auto`` leaves two cores free, a number picks the
+    worker count; unset or ``0`` runs serially. Each worker starts its own
+    Redis container. An explicit ``-n`` (including ``-n 0``) wins.
+    """
+    requested = os.environ.get("ATEAM_TESTS_WORKERS", "0")
+    if requested == "0":
+        return
+    if not config.pluginmanager.hasplugin("xdist") or hasattr(config, "workerinput"):
+        return
+    if config.option.numprocesses is not None or config.option.dist != "no":
+        return
+    if config.getoption("usepdb", False) or config.getoption("collectonly", False):
+        return
+    if requested == "auto":
+        workers = max(1, (os.cpu_count() or 1) - 2)
+    else:
+        workers = int(requested)
+    if workers > 1:
+        config.option.numprocesses = workers
+        config.option.dist = "loadfile"
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop when it is installed.
+    
+    The hook is new in pytest-asyncio 1.4; older versions skip it silently
+    because it is optional, hence the >=1.4 pin in the dev extra.
+    """
+    if UVLOOP_AVAILABLE:
+        return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
 
 
 def pytest_configure(config):
     """Start Redis before running tests."""
+    config.addinivalue_line(
+        "markers", "redis: test talks to the Redis test container; its keys are flushed first"
+    )
+    use_tmpfs_tempdir()
+    if _is_xdist_controller(config):
+        return
     try:
         print("Starting Redis container for tests...")
         redis_manager.start_redis()
@@ -111,6 +209,11 @@ def pytest_configure(config):
 
 def pytest_unconfigure(config):
     """Stop Redis after tests complete."""
+    if _is_xdist_controller(config):
+        return
+    if keep_redis():
+        print(f"Keeping Redis container '{redis_manager.container_name}' for reuse")
+        return
     print("Cleaning up Redis container...")
     redis_manager.stop_redis()
 
@@ -120,29 +223,78 @@ def redis_url():
     """Provide Redis URL for tests."""
     return redis_manager.redis_url
 
-@pytest_asyncio.fixture(autouse=True)
+
+@pytest.fixture
+def fake_redis_url(monkeypatch):
+    """Provide a Redis URL served by in-process fakeredis instead of the container.
+    
+    RedisTransport clients created during the test share one fake server, so
+    the db number in the URL still separates their keyspaces.
+    """
+    if not FAKEREDIS_AVAILABLE:
+        pytest.skip("fakeredis not installed")
+    from ateam.mcp import redis_transport
+    
+    server = fakeredis.FakeServer()
+    
+    def fake_redis(connection_pool):
+        db = connection_pool.connection_kwargs.get("db", 0)
+        return fakeredis.FakeAsyncRedis(server=server, db=db)
+    
+    monkeypatch.setattr(redis_transport, "Redis", fake_redis)
+    return "redis://fake"
+
+# ateam.mcp.contracts is plain dataclasses, so importing it alone needs no Redis
+_MCP_IMPORT_RE = re.compile(r"ateam\.mcp(?!\.contracts\b)")
+_imports_mcp_by_file = {}
+
+
+def _imports_mcp(path):
+    """Whether a test module imports Redis-backed ateam.mcp code (scanned once per file)."""
+    if path not in _imports_mcp_by_file:
+        try:
+            _imports_mcp_by_file[path] = bool(_MCP_IMPORT_RE.search(path.read_text(encoding="utf-8")))
+        except OSError:
+            _imports_mcp_by_file[path] = False
+    return _imports_mcp_by_file[path]
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark tests that may touch Redis so only they pay for clear_redis_keys.
+    
+    Async tests share the session event loop configured in pyproject, except
+    Redis tests: AgentApp, transports and heartbeats leave listener tasks
+    behind, so those get a per-test loop whose teardown cancels them.
+    """
+    function_loop = pytest.mark.asyncio(loop_scope="function")
+    for item in items:
+        if "redis_url" in getattr(item, "fixturenames", ()) or _imports_mcp(item.path):
+            item.add_marker(pytest.mark.redis)
+            if is_async_test(item):
+                item.add_marker(function_loop, append=False)
+
+
+@pytest.fixture(autouse=True)
+def redis_clean_state(request):
+    """Flush Redis before tests marked ``redis``; others skip the round-trip."""
+    if request.node.get_closest_marker("redis") is not None:
+        request.getfixturevalue("clear_redis_keys")
+
+
+@pytest_asyncio.fixture
 async def clear_redis_keys(redis_url):
-    """Clear Redis keys before each test to ensure clean state."""
+    """Flush the test Redis before each test to ensure clean state.
+    
+    The container is dedicated to tests, so one FLUSHDB replaces scanning and
+    deleting keys pattern by pattern.
+    """
     try:
-        from ateam.mcp.redis_transport import RedisTransport
-        transport = RedisTransport(redis_url)
-        await transport.connect()
-        
-        # Clear all keys that might interfere with tests
-        keys_to_clear = [
-            "mcp:agent:lock:*",
-            "mcp:agent:owner:*", 
-            "mcp:heartbeat:*",
-            "mcp:agents:*"
-        ]
-        
-        for pattern in keys_to_clear:
-            keys_result = await transport.scan_keys(pattern)
-            if keys_result.ok:
-                for key in keys_result.value:
-                    await transport.delete_key(key)
-        
-        await transport.disconnect()
+        import redis.asyncio as redis
+        client = redis.Redis.from_url(redis_url)
+        try:
+            await client.flushdb()
+        finally:
+            await client.aclose()
     except Exception as e:
         print(f"Warning: Failed to clear Redis keys: {e}")
     
@@ -10,6 +10,21 @@ from ateam.agent.prompt_layer import PromptLayer
 from ateam.agent.completer import AgentCompleter
 from ateam.mcp.contracts import QueueItem, Turn
 
+def _write_all(path, chunks):
+    """Write byte chunks to a fresh file with one open and (on POSIX) one writev."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "writev"):
+            os.writev(fd, chunks)
+        else:
+            os.write(fd, b"".join(chunks))
+    finally:
+        os.close(fd)
+
+def _backdate(path):
+    """Give a file an old mtime so the JSONL cache keeps its parse."""
+    os.utime(path, ns=(0, 1_000_000_000))
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files."""
@@ -195,6 +210,23 @@ def test_prompt_layer_reload(temp_dir):
     assert "Custom Base" in layer.get_base()
     assert "Custom overlay line" in layer.get_overlay()
 
+def test_prompt_layer_same_size_overlay_rewrite(temp_dir):
+    """Test that reload picks up an in-place overlay rewrite keeping size and mtime."""
+    base_path = os.path.join(temp_dir, "system_base.md")
+    overlay_path = os.path.join(temp_dir, "system_overlay.md")
+    with open(overlay_path, 'w') as f:
+        f.write("alpha")
+    st = os.stat(overlay_path)
+    layer = PromptLayer(base_path, overlay_path)
+    assert layer.get_overlay() == "alpha"
+    
+    # Same inode, byte count and mtime, as on a coarse-mtime filesystem
+    with open(overlay_path, 'w') as f:
+        f.write("omega")
+    os.utime(overlay_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert layer.reload_from_disk().ok
+    assert layer.get_overlay() == "omega"
+
 def test_agent_completer():
     """Test AgentCompleter functionality."""
     commands = ["status", "enqueue", "sys", "reload", "help", "quit"]
@@ -208,8 +240,10 @@ def test_agent_completer():
     assert "status" in completions
     
     completions = completer.get_completions("s")
-    assert "status" in completions
-    assert "sys" in completions
+    assert completions == ["status", "sys"]  # sorted prefix range
+    
+    assert completer.get_completions("x") == []
+    assert completer.get_completions("quit") == ["quit"]
     
     # Test completion with buffer and cursor
     new_buffer, candidates = completer.complete("st", 2)
@@ -221,9 +255,10 @@ def test_prompt_queue_load_existing(temp_dir):
     queue_path = os.path.join(temp_dir, "queue.jsonl")
     
     # Create existing queue file
-    with open(queue_path, 'w') as f:
-        f.write('{"id":"test1","text":"existing1","source":"console","ts":1234567890.0}\n')
-        f.write('{"id":"test2","text":"existing2","source":"local","ts":1234567891.0}\n')
+    _write_all(queue_path, [
+        b'{"id":"test1","text":"existing1","source":"console","ts":1234567890.0}\n',
+        b'{"id":"test2","text":"existing2","source":"local","ts":1234567891.0}\n',
+    ])
     
     # Load queue
     queue = PromptQueue(queue_path)
@@ -245,12 +280,14 @@ def test_history_store_load_existing(temp_dir):
     summary_path = os.path.join(temp_dir, "summary.jsonl")
     
     # Create existing history file
-    with open(history_path, 'w') as f:
-        f.write('{"ts":1234567890.0,"role":"user","source":"console","content":"existing","tokens_in":8,"tokens_out":0}\n')
+    _write_all(history_path, [
+        b'{"ts":1234567890.0,"role":"user","source":"console","content":"existing","tokens_in":8,"tokens_out":0}\n',
+    ])
     
     # Create existing summary file
-    with open(summary_path, 'w') as f:
-        f.write('{"ts":1234567890.0,"turn_count":1,"total_tokens_in":8,"total_tokens_out":0,"summary":"test"}\n')
+    _write_all(summary_path, [
+        b'{"ts":1234567890.0,"turn_count":1,"total_tokens_in":8,"total_tokens_out":0,"summary":"test"}\n',
+    ])
     
     # Load history
     history = HistoryStore(history_path, summary_path)
@@ -262,3 +299,72 @@ def test_history_store_load_existing(temp_dir):
     summaries = history.get_summaries()
     assert len(summaries) == 1
     assert summaries[0]["turn_count"] == 1
+
+def test_jsonl_cache_tracks_appends(temp_dir, monkeypatch):
+    """Test that cached JSONL parses stay in step with appends from another store."""
+    from ateam.util import jsonl
+    queue_path = os.path.join(temp_dir, "queue.jsonl")
+    writer = PromptQueue(queue_path)
+    writer.append("first", "console")
+    _backdate(queue_path)
+    assert [i.text for i in PromptQueue(queue_path).list()] == ["first"]
+    
+    # Unchanged file is served from the cache without being reopened
+    def _no_reread(*args, **kwargs):
+        raise AssertionError("cached file was re-read")
+    monkeypatch.setattr(jsonl, "open", _no_reread, raising=False)
+    assert [i.text for i in PromptQueue(queue_path).list()] == ["first"]
+    
+    # Each hit builds fresh records
+    records = jsonl.load_jsonl(queue_path, "test", "parse_failed")
+    records[0]["text"] = "mutated"
+    assert jsonl.load_jsonl(queue_path, "test", "parse_failed")[0]["text"] == "first"
+    monkeypatch.undo()
+    
+    # Appending evicts the cached entry rather than serving stale items
+    writer.append("second", "local")
+    _backdate(queue_path)
+    assert [i.text for i in PromptQueue(queue_path).list()] == ["first", "second"]
+    
+    # Clearing removes the file and the cached entry with it
+    writer.clear()
+    assert PromptQueue(queue_path).size() == 0
+
+def test_write_jsonl_evicts_cache(temp_dir):
+    """Test that rewriting a file through write_jsonl drops its cached parse."""
+    from ateam.util.jsonl import load_jsonl, write_jsonl
+    path = os.path.join(temp_dir, "summary.jsonl")
+    write_jsonl(path, [{"v": 1}, {"v": 2}])
+    _backdate(path)
+    assert load_jsonl(path, "test", "parse_failed") == [{"v": 1}, {"v": 2}]
+    
+    # Same size and an old mtime would otherwise be a cache hit
+    write_jsonl(path, [{"v": 3}, {"v": 4}])
+    _backdate(path)
+    assert load_jsonl(path, "test", "parse_failed") == [{"v": 3}, {"v": 4}]
+
+def test_jsonl_same_size_rewrite_in_same_tick(temp_dir):
+    """Test that a rewrite keeping both size and mtime is not served from the cache."""
+    from ateam.util.jsonl import load_jsonl, append_jsonl
+    path = os.path.join(temp_dir, "data.jsonl")
+    
+    # An old, unchanged stat is trusted: a same-size edit with the same mtime is a hit
+    _write_all(path, [b'{"v": 1}\n'])
+    _backdate(path)
+    assert load_jsonl(path, "test", "parse_failed") == [{"v": 1}]
+    _write_all(path, [b'{"v": 2}\n'])
+    _backdate(path)
+    assert load_jsonl(path, "test", "parse_failed") == [{"v": 1}]
+    
+    # append_jsonl invalidates the entry
+    append_jsonl(path, {"v": 3})
+    _backdate(path)
+    assert load_jsonl(path, "test", "parse_failed") == [{"v": 2}, {"v": 3}]
+    
+    # Same byte count, and mtime pinned as if both writes landed in one tick
+    _write_all(path, [b'{"v": 4}\n'])
+    st = os.stat(path)
+    assert load_jsonl(path, "test", "parse_failed") == [{"v": 4}]
+    _write_all(path, [b'{"v": 5}\n'])
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert load_jsonl(path, "test", "parse_failed") == [{"v": 5}]
@@ -3,34 +3,57 @@ Tests for high-value test cases from change3.md.
 """
 
 import pytest
-import asyncio
-import tempfile
-import os
 from pathlib import Path
-from unittest.mock import Mock, AsyncMock
 from ateam.agent.main import AgentApp
 from ateam.agent.runner import TaskRunner
 
 
+class _TailStub:
+    """No-op stand-in for TailEmitter; nothing here asserts on tail events."""
+    
+    async def connect(self):
+        return None
+    
+    async def disconnect(self):
+        return None
+    
+    async def emit(self, event):
+        return None
+
+
 class TestChange3HighValueCases:
     """Test high-value cases from change3.md."""
     
-    @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory for testing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            yield tmpdir
+    @pytest.fixture(scope="module")
+    def temp_dir(self, tmp_path_factory):
+        """Create a temporary directory shared by the read-only tests."""
+        return str(tmp_path_factory.mktemp("change3"))
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_agent_app(self, temp_dir):
-        """Create a mock agent app for testing."""
+        """Create a mock agent app once for the module."""
         app = AgentApp(redis_url=None, cwd=temp_dir)  # Standalone mode
         
-        # Mock the tail emitter
-        app.tail = AsyncMock()
+        # Stub the tail emitter
+        app.tail = _TailStub()
         
         return app
     
+    @pytest.fixture
+    def prompt_scaffold(self, tmp_path):
+        """Create base and empty overlay prompt files."""
+        base_path = tmp_path / "base.md"
+        overlay_path = tmp_path / "overlay.md"
+        base_path.write_text("Base prompt")
+        overlay_path.write_text("")
+        return base_path, overlay_path
+    
+    @pytest.fixture(scope="module")
+    def completer(self, mock_agent_app):
+        """Create one console completer for the read-only completion tests."""
+        from ateam.console.completer import ConsoleCompleter
+        return ConsoleCompleter(mock_agent_app)
+    
     def test_identity_and_lock_duplicate_agent(self, temp_dir):
         """Test that two agents with same id on same Redis exit with code 11."""
         # This test would require Redis integration
@@ -43,35 +66,34 @@ class TestChange3HighValueCases:
         assert app1.standalone_mode
         assert app2.standalone_mode
     
-    @pytest.mark.asyncio
-    async def test_ownership_attach_unowned(self, mock_agent_app):
+    def test_ownership_attach_unowned(self, mock_agent_app):
         """Test attach when unowned → success; write operations accepted."""
         # This would test ownership management
         # For now, we'll test that the agent can be created
         assert mock_agent_app is not None
         assert mock_agent_app.standalone_mode
     
-    @pytest.mark.asyncio
-    async def test_ownership_second_attach_denied(self, mock_agent_app):
+    @pytest.mark.skip(reason="placeholder: needs a Redis-backed ownership scenario")
+    def test_ownership_second_attach_denied(self, mock_agent_app):
         """Test second attach without takeover → denied."""
         # This would test ownership denial
         # For now, we'll test basic functionality
         assert mock_agent_app is not None
     
-    @pytest.mark.asyncio
-    async def test_ownership_takeover(self, mock_agent_app):
+    @pytest.mark.skip(reason="placeholder: needs a Redis-backed ownership scenario")
+    def test_ownership_takeover(self, mock_agent_app):
         """Test takeover → old becomes read-only; new can write."""
         # This would test takeover functionality
         # For now, we'll test basic functionality
         assert mock_agent_app is not None
     
     @pytest.mark.asyncio
-    async def test_queue_history_append_peek_pop(self, mock_agent_app, temp_dir):
+    async def test_queue_history_append_peek_pop(self, mock_agent_app, tmp_path):
         """Test append, peek, pop roundtrip; fsync durability."""
         from ateam.agent.queue import PromptQueue
         
         # Create queue
-        queue_path = os.path.join(temp_dir, "queue.jsonl")
+        queue_path = str(tmp_path / "queue.jsonl")
         queue = PromptQueue(queue_path)
         
         # Test append
@@ -91,23 +113,15 @@ class TestChange3HighValueCases:
         assert pop_result.id == qid
     
     @pytest.mark.asyncio
-    async def test_prompts_reloadsysprompt(self, mock_agent_app, temp_dir):
+    async def test_prompts_reloadsysprompt(self, mock_agent_app, prompt_scaffold):
         """Test `/reloadsysprompt` applies new overlay."""
         from ateam.agent.prompt_layer import PromptLayer
         
-        # Create prompt files
-        base_path = os.path.join(temp_dir, "base.md")
-        overlay_path = os.path.join(temp_dir, "overlay.md")
-        
-        # Write initial content
-        with open(base_path, 'w') as f:
-            f.write("Base prompt")
-        
-        with open(overlay_path, 'w') as f:
-            f.write("Initial overlay")
+        base_path, overlay_path = prompt_scaffold
+        overlay_path.write_text("Initial overlay")
         
         # Create prompt layer
-        prompts = PromptLayer(base_path, overlay_path)
+        prompts = PromptLayer(str(base_path), str(overlay_path))
         
         # Check initial effective prompt
         effective = prompts.effective()
@@ -115,8 +129,7 @@ class TestChange3HighValueCases:
         assert "Initial overlay" in effective
         
         # Update overlay file
-        with open(overlay_path, 'w') as f:
-            f.write("Updated overlay")
+        overlay_path.write_text("Updated overlay")
         
         # Reload
         prompts.reload_from_disk()
@@ -128,20 +141,14 @@ class TestChange3HighValueCases:
         assert "Initial overlay" not in effective
     
     @pytest.mark.asyncio
-    async def test_prompts_overlay_line(self, mock_agent_app, temp_dir):
+    async def test_prompts_overlay_line(self, mock_agent_app, prompt_scaffold):
         """Test `# <line>` appends to overlay & effective prompt reflects it."""
         from ateam.agent.prompt_layer import PromptLayer
         
-        # Create prompt files
-        base_path = os.path.join(temp_dir, "base.md")
-        overlay_path = os.path.join(temp_dir, "overlay.md")
-        
-        # Write initial content
-        with open(base_path, 'w') as f:
-            f.write("Base prompt")
+        base_path, overlay_path = prompt_scaffold
         
         # Create prompt layer
-        prompts = PromptLayer(base_path, overlay_path)
+        prompts = PromptLayer(str(base_path), str(overlay_path))
         
         # Add overlay line
         result = prompts.append_overlay("Test overlay line")
@@ -153,12 +160,12 @@ class TestChange3HighValueCases:
         assert "Test overlay line" in effective
     
     @pytest.mark.asyncio
-    async def test_kb_ingest_dedupes(self, mock_agent_app, temp_dir):
+    async def test_kb_ingest_dedupes(self, mock_agent_app, tmp_path):
         """Test `kb.ingest` de-dupes by hash."""
         from ateam.kb.storage import KBStorage
         
         # Create KB storage
-        kb = KBStorage(temp_dir)
+        kb = KBStorage(str(tmp_path))
         
         # Add same content twice
         content1 = "Test content"
@@ -182,18 +189,16 @@ class TestChange3HighValueCases:
         assert item1["content_hash"] == item2["content_hash"]
     
     @pytest.mark.asyncio
-    async def test_kb_copy_from_selected_ids(self, mock_agent_app, temp_dir):
+    async def test_kb_copy_from_selected_ids(self, mock_agent_app, tmp_path):
         """Test `kb.copy_from` only copies selected ids."""
         from ateam.kb.storage import KBStorage
         
-        # Create source and target KB
-        source_dir = os.path.join(temp_dir, "source")
-        target_dir = os.path.join(temp_dir, "target")
-        os.makedirs(source_dir)
-        os.makedirs(target_dir)
+        # Create source and target KB (KBStorage creates its own directory)
+        source_dir = tmp_path / "source"
+        target_dir = tmp_path / "target"
         
-        source_kb = KBStorage(source_dir)
-        target_kb = KBStorage(target_dir)
+        source_kb = KBStorage(str(source_dir))
+        target_kb = KBStorage(str(target_dir))
         
         # Add documents to source
         source_kb.add("collection1", "Content 1")
@@ -208,45 +213,29 @@ class TestChange3HighValueCases:
                 target_kb.add(collection_id, item["content"])
         
         # Check target has only selected collections
-        target_collections = [f for f in os.listdir(target_dir) if f.endswith('.json')]
-        assert len(target_collections) == 2
-        assert any("collection1" in f for f in target_collections)
-        assert any("collection3" in f for f in target_collections)
-        assert not any("collection2" in f for f in target_collections)
+        target_collections = {p.name for p in target_dir.glob("*.json")}
+        assert target_collections == {"collection1.json", "collection3.json"}
     
-    @pytest.mark.asyncio
-    async def test_autocomplete_command(self, mock_agent_app):
+    def test_autocomplete_command(self, completer):
         """Test `/att<TAB>` → `/attach`."""
-        from ateam.console.completer import ConsoleCompleter
-        
-        # Create completer with mock app
-        completer = ConsoleCompleter(mock_agent_app)
-        
         # Test that /attach command exists in commands
         assert "/attach" in completer.commands
         assert completer.commands["/attach"] == "Attach to an agent"
     
-    @pytest.mark.asyncio
-    async def test_path_completion_quotes(self, mock_agent_app):
+    def test_path_completion_quotes(self, completer):
         """Test path completion with spaces and quotes (Windows/Unix)."""
-        from ateam.console.completer import ConsoleCompleter
-        
-        # Create completer with mock app
-        completer = ConsoleCompleter(mock_agent_app)
-        
         # Test that completer has path completion capabilities
         assert hasattr(completer, 'get_completions')
         assert hasattr(completer, 'commands')
     
-    @pytest.mark.asyncio
-    async def test_panes_off_dumb_terminal(self, mock_agent_app):
+    @pytest.mark.skip(reason="placeholder: needs a console UI under a dumb terminal")
+    def test_panes_off_dumb_terminal(self, mock_agent_app):
         """Test `--no-ui` works in dumb terminals."""
         # This would test console UI without panes
         # For now, we'll test basic functionality
         assert mock_agent_app is not None
     
-    @pytest.mark.asyncio
-    async def test_secrets_redaction(self, mock_agent_app):
+    def test_secrets_redaction(self, mock_agent_app):
         """Test secrets redaction in token stream & logs."""
         from ateam.util.secrets import redact
         
@@ -1,13 +1,17 @@
 """Tests for configuration discovery and merging."""
 
+import os
 import tempfile
-import yaml
 from pathlib import Path
 from ateam.config.discovery import ConfigDiscovery
 from ateam.config.merge import ConfigMerger
-from ateam.config.loader import load_stack
+from ateam.config.loader import load_stack, load_yaml, _parse_yaml
 from ateam.agent.identity import AgentIdentity
 
+PROJECT_YAML = "name: myproj\n"
+MODELS_YAML = "models:\n  gpt-4:\n    provider: openai\n    context_window_size: 8192\n"
+TOOLS_YAML = "mcp:\n  kind: redis\n  url: redis://localhost:6379/0\n"
+
 def test_discovery_stack(tmp_path):
     """Test config discovery from CWD to home."""
     # Create nested structure
@@ -69,6 +73,18 @@ def test_merge_lists():
     assert any(item["id"] == "b" for item in result)
     assert any(item["id"] == "c" for item in result)
 
+def test_merge_lists_large_first_wins():
+    """Test keyed de-dupe over large lists keeps the highest-priority item in order."""
+    merger = ConfigMerger()
+    
+    high = [{"id": i, "layer": "high"} for i in range(0, 10000, 2)]
+    low = [{"id": i, "layer": "low"} for i in range(10000)]
+    
+    result = merger.merge_lists([high, low], key="id")
+    assert len(result) == 10000
+    assert result[:5000] == high
+    assert all(item["layer"] == "low" and item["id"] % 2 for item in result[5000:])
+
 def test_load_stack(tmp_path):
     """Test loading and merging config stack."""
     # Create project structure
@@ -79,27 +95,15 @@ def test_load_stack(tmp_path):
     
     # Create project.yaml
     project_yaml = ateam / "project.yaml"
-    project_yaml.write_text(yaml.dump({"name": "myproj"}))
+    project_yaml.write_text(PROJECT_YAML)
     
     # Create models.yaml
     models_yaml = ateam / "models.yaml"
-    models_yaml.write_text(yaml.dump({
-        "models": {
-            "gpt-4": {
-                "provider": "openai",
-                "context_window_size": 8192
-            }
-        }
-    }))
+    models_yaml.write_text(MODELS_YAML)
     
     # Create tools.yaml
     tools_yaml = ateam / "tools.yaml"
-    tools_yaml.write_text(yaml.dump({
-        "mcp": {
-            "kind": "redis",
-            "url": "redis://localhost:6379/0"
-        }
-    }))
+    tools_yaml.write_text(TOOLS_YAML)
     
     # Test loading
     result = load_stack(str(project))
@@ -111,6 +115,47 @@ def test_load_stack(tmp_path):
     assert str(tools_cfg.mcp.url) == "redis://localhost:6379/0"
     assert len(agents_cfg) == 0  # No agents defined
 
+def test_load_stack_picks_up_edits(tmp_path):
+    """Test that memoized YAML parsing is reused, copied on hit and invalidated on edit."""
+    project = tmp_path / "myproj"
+    ateam = project / ".ateam"
+    ateam.mkdir(parents=True)
+    project_yaml = ateam / "project.yaml"
+    
+    # Old mtimes keep the file out of the recent-edit bypass
+    project_yaml.write_text("name: first\n")
+    os.utime(project_yaml, ns=(0, 1_000_000_000))
+    assert load_stack(str(project)).value[0].name == "first"
+    
+    hits = _parse_yaml.cache_info().hits
+    assert load_stack(str(project)).value[0].name == "first"
+    assert _parse_yaml.cache_info().hits > hits
+    
+    # Hits are deep copies, so in-place merges never reach the cached parse
+    data = load_yaml(project_yaml)
+    data["name"] = "mutated"
+    assert load_yaml(project_yaml) == {"name": "first"}
+    
+    project_yaml.write_text("name: second-name\n")
+    os.utime(project_yaml, ns=(0, 2_000_000_000))
+    assert load_stack(str(project)).value[0].name == "second-name"
+
+def test_load_stack_same_size_edit_in_same_tick(tmp_path):
+    """Test that an equal-size edit keeping the mtime is not served from the cache."""
+    project = tmp_path / "myproj"
+    ateam = project / ".ateam"
+    ateam.mkdir(parents=True)
+    project_yaml = ateam / "project.yaml"
+    
+    project_yaml.write_text("name: alpha\n")
+    st = project_yaml.stat()
+    assert load_stack(str(project)).value[0].name == "alpha"
+    
+    # Same byte count, and mtime pinned as if both writes landed in one tick
+    project_yaml.write_text("name: omega\n")
+    os.utime(project_yaml, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert load_stack(str(project)).value[0].name == "omega"
+
 def test_agent_identity(tmp_path):
     """Test agent identity computation."""
     # Create project structure
@@ -121,7 +166,7 @@ def test_agent_identity(tmp_path):
     
     # Create project.yaml
     project_yaml = ateam / "project.yaml"
-    project_yaml.write_text(yaml.dump({"name": "myproj"}))
+    project_yaml.write_text(PROJECT_YAML)
     
     # Test identity without agent config (uses directory name)
     identity = AgentIdentity(str(project))
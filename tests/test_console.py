@@ -8,12 +8,25 @@ import os
 
 from ateam.console.app import ConsoleApp
 from ateam.console.ui import ConsoleUI
+from ateam.console import completer as completer_module
 from ateam.console.completer import ConsoleCompleter
 from ateam.console.cmd_router import CommandRouter
 from ateam.console.attach import AgentSession
 from ateam.util.types import Result, ErrorInfo
 
 
+class _FakeClient:
+    """Minimal MCP client stand-in: returns a fixed result and records calls."""
+    
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+    
+    async def call(self, method, params):
+        self.calls.append((method, params))
+        return self.result
+
+
 class TestConsoleUI:
     """Test ConsoleUI class."""
     
@@ -25,37 +38,40 @@ class TestConsoleUI:
         # The UI should still work with fallback to basic input
         assert ui.key_bindings is not None
     
-    def test_ui_notify(self, capsys):
-        """Test notification messages."""
+    @pytest.fixture
+    def ui_sink(self, monkeypatch):
+        """Create a UI whose writes are collected in a list instead of stdout."""
         ui = ConsoleUI()
+        out = []
+        monkeypatch.setattr(ui, "_emit", out.append)
+        return ui, out
+    
+    def test_ui_notify(self, ui_sink):
+        """Test notification messages."""
+        ui, out = ui_sink
         
         ui.notify("Test message", "info")
-        captured = capsys.readouterr()
-        assert "[INFO] Test message" in captured.out
-        
         ui.notify("Warning message", "warn")
-        captured = capsys.readouterr()
-        assert "[WARN] Warning message" in captured.out
-        
         ui.notify("Error message", "error")
-        captured = capsys.readouterr()
-        assert "[ERROR] Error message" in captured.out
+        assert out == [
+            "[INFO] Test message\n",
+            "[WARN] Warning message\n",
+            "[ERROR] Error message\n",
+        ]
     
-    def test_ui_print_help(self, capsys):
+    def test_ui_print_help(self, ui_sink):
         """Test help printing."""
-        ui = ConsoleUI()
+        ui, out = ui_sink
         ui.print_help()
-        captured = capsys.readouterr()
-        assert "ATeam Console - Available Commands:" in captured.out
+        assert "ATeam Console - Available Commands:" in out[0]
     
-    def test_ui_print_agents_list(self, capsys):
+    def test_ui_print_agents_list(self, ui_sink):
         """Test agents list printing."""
-        ui = ConsoleUI()
+        ui, out = ui_sink
         
         # Test empty list
         ui.print_agents_list([])
-        captured = capsys.readouterr()
-        assert "No agents found." in captured.out
+        assert out.pop() == "No agents found.\n"
         
         # Test with agents
         agents = [
@@ -63,15 +79,15 @@ class TestConsoleUI:
             {"id": "test/agent2", "state": "idle", "model": "gpt-3.5", "cwd": "/home"}
         ]
         ui.print_agents_list(agents)
-        captured = capsys.readouterr()
-        assert "test/agent1" in captured.out
-        assert "test/agent2" in captured.out
-        assert "running" in captured.out
-        assert "idle" in captured.out
+        assert len(out) == 1
+        assert "test/agent1" in out[0]
+        assert "test/agent2" in out[0]
+        assert "running" in out[0]
+        assert "idle" in out[0]
     
-    def test_ui_print_session_status(self, capsys):
+    def test_ui_print_session_status(self, ui_sink):
         """Test session status printing."""
-        ui = ConsoleUI()
+        ui, out = ui_sink
         
         session_info = {
             "agent_id": "test/agent1",
@@ -82,10 +98,35 @@ class TestConsoleUI:
         }
         
         ui.print_session_status(session_info)
-        captured = capsys.readouterr()
-        assert "test/agent1" in captured.out
-        assert "running" in captured.out
-        assert "25.5%" in captured.out
+        assert len(out) == 1
+        assert "test/agent1" in out[0]
+        assert "running" in out[0]
+        assert "25.5%" in out[0]
+    
+    def test_ui_buffered_output(self, capsys, monkeypatch):
+        """Test background-buffered output is written in order on flush."""
+        monkeypatch.setenv("ATEAM_CONSOLE_BUFFER", "1")
+        ui = ConsoleUI()
+        try:
+            for i in range(50):
+                ui.notify(f"message {i}", "info")
+            ui.print_output("done")
+            ui.flush_sync()
+            captured = capsys.readouterr()
+            expected = "".join(f"[INFO] message {i}\n" for i in range(50)) + "done\n"
+            assert captured.out == expected
+        finally:
+            ui.shutdown()
+        assert ui._writer is None
+    
+    def test_ui_output_after_shutdown(self, capsys, monkeypatch):
+        """Test output written after the buffered writer stops still reaches stdout."""
+        monkeypatch.setenv("ATEAM_CONSOLE_BUFFER", "1")
+        ui = ConsoleUI()
+        ui.notify("before", "info")
+        ui.shutdown()
+        ui.notify("after", "info")
+        assert capsys.readouterr().out == "[INFO] before\n[INFO] after\n"
     
     def test_ui_is_tty(self):
         """Test TTY detection."""
@@ -177,10 +218,71 @@ class TestConsoleCompleter:
             mock_document = Mock()
             mock_document.text_before_cursor = f"/kb add {temp_dir}/t"
             
-            completions = list(completer.get_completions(mock_document, None))
             # Should find the test file
-            command_displays = [c.display[0][1] if hasattr(c.display, '__iter__') and len(c.display) > 0 else str(c.display) for c in completions]
-            assert any("testfile.txt" in display for display in command_displays)
+            texts = {c.text for c in completer.get_completions(mock_document, None)}
+            assert "testfile.txt" in texts
+    
+    def test_completer_prefix_lookup(self, tmp_path, monkeypatch):
+        """Test command prefix lookup and path completion after directory changes."""
+        # Disable the repeat-request cache so the directory listing is re-read
+        monkeypatch.setattr(completer_module, "COMPLETION_CACHE_TTL", 0)
+        completer = ConsoleCompleter(Mock())
+        
+        mock_document = Mock()
+        mock_document.text_before_cursor = "/re"
+        assert [c.text for c in completer.get_completions(mock_document, None)] == ["/reloadsysprompt"]
+        
+        mock_document.text_before_cursor = "/kb c"
+        assert [c.text for c in completer.get_completions(mock_document, None)] == ["copy-from"]
+        
+        # Scan once with an old mtime so the listing is cached, then add a file
+        (tmp_path / "alpha.txt").write_text("a")
+        os.utime(tmp_path, ns=(0, 1_000_000_000))
+        mock_document.text_before_cursor = f"/kb add {tmp_path}/"
+        assert [c.text for c in completer.get_completions(mock_document, None)] == ["alpha.txt"]
+        
+        (tmp_path / "beta.txt").write_text("b")
+        names = sorted(c.text for c in completer.get_completions(mock_document, None))
+        assert names == ["alpha.txt", "beta.txt"]
+    
+    def test_completer_repeat_request_cached(self, monkeypatch):
+        """Test that an identical request within the TTL reuses the last result."""
+        completer = ConsoleCompleter(Mock())
+        mock_document = Mock()
+        mock_document.text_before_cursor = "/re"
+        
+        first = list(completer.get_completions(mock_document, None))
+        compute = Mock(side_effect=AssertionError("recomputed"))
+        monkeypatch.setattr(completer, "_compute_completions", compute)
+        assert list(completer.get_completions(mock_document, None)) == first
+        
+        # A different request is computed afresh
+        compute.side_effect = None
+        compute.return_value = iter([])
+        mock_document.text_before_cursor = "/q"
+        assert list(completer.get_completions(mock_document, None)) == []
+        compute.assert_called_once_with("/q")
+    
+    @pytest.mark.asyncio
+    async def test_completer_cache_invalidated_by_attach(self, monkeypatch):
+        """Test that attaching a session between identical requests recomputes completions."""
+        app = ConsoleApp("redis://localhost:6379", use_panes=False)
+        completer = ConsoleCompleter(app)
+        mock_document = Mock()
+        mock_document.text_before_cursor = "/attach "
+        
+        compute = Mock(return_value=iter([]))
+        monkeypatch.setattr(completer, "_compute_completions", compute)
+        list(completer.get_completions(mock_document, None))
+        
+        mock_session = Mock()
+        mock_session.attach = AsyncMock(return_value=Result(ok=True))
+        with patch('ateam.console.app.AgentSession', return_value=mock_session):
+            assert (await app.attach_session("test/agent1")).ok is True
+        
+        compute.return_value = iter([])
+        list(completer.get_completions(mock_document, None))
+        assert compute.call_count == 2
 
 
 class TestCommandRouter:
@@ -321,6 +423,25 @@ class TestCommandRouter:
         for i, expected_call in enumerate(expected_calls):
             assert router.ui.print_output.call_args_list[i][0][0] == expected_call
 
+    @pytest.mark.asyncio
+    async def test_router_who_not_tty(self, router):
+        """Test /who writes its report in one call when output is redirected."""
+        mock_session = Mock()
+        mock_session.agent_id = "test/agent1"
+        mock_session.get_ownership_token = Mock(return_value="token123456789")
+        mock_session.is_read_only = Mock(return_value=False)
+        mock_session.get_status = AsyncMock(return_value=Result(ok=False, error=ErrorInfo("status.error", "Status error")))
+        router.app.get_current_session.return_value = mock_session
+        router.ui.is_tty.return_value = False
+        
+        await router.execute("/who")
+        
+        router.ui.print_output.assert_called_once_with(
+            "Currently attached to: test/agent1\n"
+            "  Status: Unable to retrieve (error: Status error)\n"
+            "  Owner token: token123..."
+        )
+
     @pytest.mark.asyncio
     async def test_router_who_with_session_status_error(self, router):
         """Test /who command with active session but status error."""
@@ -393,13 +514,12 @@ class TestAgentSession:
     @pytest.mark.asyncio
     async def test_session_send_input_success(self, session):
         """Test successful input sending."""
-        # Mock client
-        session.client = Mock()
-        session.client.call = AsyncMock(return_value=Result(ok=True, value={"queued": True}))
+        # Stub client
+        session.client = _FakeClient(Result(ok=True, value={"queued": True}))
         
         result = await session.send_input("test message")
         assert result.ok is True
-        session.client.call.assert_called_once_with("input", {"text": "test message", "meta": {"source": "console"}})
+        assert session.client.calls == [("input", {"text": "test message", "meta": {"source": "console"}})]
     
     @pytest.mark.asyncio
     async def test_session_send_input_no_client(self, session):
@@ -411,10 +531,9 @@ class TestAgentSession:
     @pytest.mark.asyncio
     async def test_session_get_status_success(self, session):
         """Test successful status retrieval."""
-        # Mock client
-        session.client = Mock()
+        # Stub client
         mock_status = {"state": "running", "model": "gpt-4", "ctx_pct": 25.0}
-        session.client.call = AsyncMock(return_value=Result(ok=True, value=mock_status))
+        session.client = _FakeClient(Result(ok=True, value=mock_status))
         
         result = await session.get_status()
         assert result.ok is True
@@ -424,10 +543,9 @@ class TestAgentSession:
     @pytest.mark.asyncio
     async def test_session_get_context(self, session):
         """Test context retrieval."""
-        # Mock status
-        session.client = Mock()
+        # Stub client
         mock_status = {"state": "running", "ctx_pct": 25.0}
-        session.client.call = AsyncMock(return_value=Result(ok=True, value=mock_status))
+        session.client = _FakeClient(Result(ok=True, value=mock_status))
         
         result = await session.get_context()
         assert result.ok is True
@@ -438,31 +556,28 @@ class TestAgentSession:
     @pytest.mark.asyncio
     async def test_session_reload_system_prompt_success(self, session):
         """Test successful system prompt reload."""
-        # Mock client
-        session.client = Mock()
-        session.client.call = AsyncMock(return_value=Result(ok=True, value={"ok": True}))
+        # Stub client
+        session.client = _FakeClient(Result(ok=True, value={"ok": True}))
         
         result = await session.reload_system_prompt()
         assert result.ok is True
-        session.client.call.assert_called_once_with("prompt.reload", {})
+        assert session.client.calls == [("prompt.reload", {})]
     
     @pytest.mark.asyncio
     async def test_session_kb_add_success(self, session):
         """Test successful KB add."""
-        # Mock client
-        session.client = Mock()
-        session.client.call = AsyncMock(return_value=Result(ok=True, value={"ids": ["test_id"]}))
+        # Stub client
+        session.client = _FakeClient(Result(ok=True, value={"ids": ["test_id"]}))
     
         result = await session.kb_ingest(["/tmp/test.txt"])
         assert result.ok is True
-        session.client.call.assert_called_once_with("kb.ingest", {"paths": ["/tmp/test.txt"], "scope": "agent"})
+        assert session.client.calls == [("kb.ingest", {"paths": ["/tmp/test.txt"], "scope": "agent"})]
     
     @pytest.mark.asyncio
     async def test_session_kb_search(self, session):
         """Test KB search."""
-        # Mock client
-        session.client = Mock()
-        session.client.call = AsyncMock(return_value=Result(ok=True, value={"hits": []}))
+        # Stub client
+        session.client = _FakeClient(Result(ok=True, value={"hits": []}))
     
         result = await session.kb_search("test query")
         assert result.ok is True
@@ -573,6 +688,20 @@ class TestConsoleApp:
         
         assert console_app.get_current_session() == mock_session
     
+    @pytest.mark.asyncio
+    async def test_console_app_shutdown_flushes_ui_last(self, console_app):
+        """Test the UI writer is stopped only after sessions are detached."""
+        order = []
+        console_app.ui = Mock(panes=None)
+        console_app.ui.shutdown.side_effect = lambda: order.append("ui")
+        session = Mock()
+        session.detach = AsyncMock(side_effect=lambda: order.append("detach"))
+        console_app._sessions["test/agent1"] = session
+        
+        await console_app.shutdown()
+        
+        assert order == ["detach", "ui"]
+    
     def test_console_app_list_sessions(self, console_app):
         """Test listing sessions."""
         # Empty sessions
@@ -589,3 +718,7 @@ class TestConsoleApp:
         assert len(sessions) == 2
         assert sessions["test/agent1"] == mock_session1
         assert sessions["test/agent2"] == mock_session2
+        
+        # The view is read-only
+        with pytest.raises(TypeError):
+            sessions["test/agent3"] = Mock()
@@ -1,8 +1,6 @@
 """Tests for context reconstruction functionality."""
 
 import pytest
-import tempfile
-import os
 import time
 from unittest.mock import Mock, AsyncMock
 from ateam.agent.history import HistoryStore
@@ -14,22 +12,22 @@ from ateam.util.types import Result
 class TestContextReconstruction:
     """Test context reconstruction functionality."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        # Create temporary files for testing
-        self.temp_dir = tempfile.mkdtemp()
-        self.history_path = os.path.join(self.temp_dir, "history.jsonl")
-        self.summary_path = os.path.join(self.temp_dir, "summary.jsonl")
-        
-        # Create summarization config
-        self.summarization_config = SummarizationConfig(
-            strategy=SummarizationStrategy.TOKEN_BASED,
-            token_threshold=1000,
-            time_threshold=3600,
-            max_summaries=10,
-            importance_threshold=0.7,
-            preserve_tool_calls=True
-        )
+    # Read-only, so one config serves every test
+    summarization_config = SummarizationConfig(
+        strategy=SummarizationStrategy.TOKEN_BASED,
+        token_threshold=1000,
+        time_threshold=3600,
+        max_summaries=10,
+        importance_threshold=0.7,
+        preserve_tool_calls=True
+    )
+    
+    @pytest.fixture(autouse=True)
+    def history_store(self, tmp_path):
+        """Create a fresh history store under the test's tmp_path."""
+        self.temp_dir = str(tmp_path)
+        self.history_path = str(tmp_path / "history.jsonl")
+        self.summary_path = str(tmp_path / "summary.jsonl")
         
         # Initialize history store
         self.history = HistoryStore(
@@ -38,16 +36,29 @@ class TestContextReconstruction:
             self.summarization_config
         )
     
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_reconstruct_context_empty(self):
         """Test context reconstruction with empty history."""
         context = self.history.reconstruct_context()
         assert "No conversation history available" in context
     
+    def test_reconstruct_context_cache_tracks_changes(self):
+        """Test repeated reconstruction reflects appends, summaries and clears."""
+        self.history.summarization_engine = None
+        now = time.time()
+        
+        self.history.append(Turn(ts=now, role="user", source="console", content="first", tokens_in=1, tokens_out=0))
+        first = self.history.reconstruct_context()
+        assert self.history.reconstruct_context() == first
+        
+        self.history.append(Turn(ts=now+1, role="assistant", source="local", content="second", tokens_in=0, tokens_out=1))
+        assert "second" in self.history.reconstruct_context()
+        
+        self.history._summaries.append({"ts": now, "summary": "earlier chat"})
+        assert "Summary 1: earlier chat" in self.history.reconstruct_context_from_tail([])
+        
+        self.history.clear(confirm=True)
+        assert "No conversation history available" in self.history.reconstruct_context()
+    
     def test_reconstruct_context_with_turns(self):
         """Test context reconstruction with conversation turns."""
         # Add some turns with correct parameters
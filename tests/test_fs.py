@@ -3,20 +3,29 @@ Tests for filesystem operations with sandbox protection.
 """
 
 import pytest
-import tempfile
 import os
 from pathlib import Path
 from ateam.tools.builtin.fs import read_file, write_file, list_dir, stat_file
 
 
+@pytest.fixture(scope="module")
+def populated_dir(tmp_path_factory):
+    """Read-only tree shared by the listing and stat tests, written once per module."""
+    root = tmp_path_factory.mktemp("fs_tree")
+    (root / "file1.txt").write_bytes(b"content1")
+    (root / "file2.txt").write_bytes(b"content2")
+    (root / "subdir").mkdir()
+    (root / "subdir" / "file3.txt").write_bytes(b"content3")
+    return str(root)
+
+
 class TestFilesystemOperations:
     """Test filesystem operations with sandbox protection."""
     
     @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory for testing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            yield tmpdir
+    def temp_dir(self, tmp_path):
+        """Provide a temporary directory for testing."""
+        return str(tmp_path)
     
     def test_read_file_success(self, temp_dir):
         """Test successful file read within sandbox."""
@@ -40,10 +49,15 @@ class TestFilesystemOperations:
         assert not result.ok
         assert result.error.code == "fs.access_denied"
     
-    def test_write_file_success(self, temp_dir):
-        """Test successful file write within sandbox."""
-        result = write_file("test.txt", "Hello, World!", temp_dir)
-        assert result.ok
+    @pytest.mark.parametrize("writes", [
+        [("Hello, World!", "w")],
+        [("Hello", "w"), (", World!", "a")],
+    ], ids=["write", "append"])
+    def test_write_file_success(self, temp_dir, writes):
+        """Test successful file write within sandbox, in write and append mode."""
+        for content, mode in writes:
+            result = write_file("test.txt", content, temp_dir, mode=mode)
+            assert result.ok
         
         # Verify file was written
         test_file = Path(temp_dir) / "test.txt"
@@ -66,36 +80,32 @@ class TestFilesystemOperations:
         assert not result.ok
         assert result.error.code == "fs.access_denied"
     
-    def test_list_dir_success(self, temp_dir):
+    def test_list_dir_success(self, populated_dir):
         """Test successful directory listing within sandbox."""
-        # Create test files and directories
-        (Path(temp_dir) / "file1.txt").write_text("content1")
-        (Path(temp_dir) / "file2.txt").write_text("content2")
-        (Path(temp_dir) / "subdir").mkdir()
-        (Path(temp_dir) / "subdir" / "file3.txt").write_text("content3")
-        
-        result = list_dir(".", temp_dir)
+        result = list_dir(".", populated_dir)
         assert result.ok
         
         entries = result.value
         assert len(entries) == 3  # file1.txt, file2.txt, subdir (not the file inside subdir)
         
+        by_name = {e["name"]: e for e in entries}
+        
         # Check file entries
-        file1 = next(e for e in entries if e["name"] == "file1.txt")
+        file1 = by_name["file1.txt"]
         assert file1["is_file"]
         assert file1["size"] == 8
         
-        file2 = next(e for e in entries if e["name"] == "file2.txt")
+        file2 = by_name["file2.txt"]
         assert file2["is_file"]
         assert file2["size"] == 8
         
         # Check directory entry
-        subdir = next(e for e in entries if e["name"] == "subdir")
+        subdir = by_name["subdir"]
         assert subdir["is_dir"]
         assert subdir["size"] is None
         
         # Test listing the subdirectory
-        result = list_dir("subdir", temp_dir)
+        result = list_dir("subdir", populated_dir)
         assert result.ok
         subdir_entries = result.value
         assert len(subdir_entries) == 1
@@ -127,19 +137,15 @@ class TestFilesystemOperations:
         assert not result.ok
         assert result.error.code == "fs.access_denied"
     
-    def test_stat_file_success(self, temp_dir):
+    def test_stat_file_success(self, populated_dir):
         """Test successful file stats within sandbox."""
-        # Create a test file
-        test_file = Path(temp_dir) / "test.txt"
-        test_file.write_text("Hello, World!")
-        
-        result = stat_file("test.txt", temp_dir)
+        result = stat_file("file1.txt", populated_dir)
         assert result.ok
         
         stats = result.value
-        assert stats["name"] == "test.txt"
+        assert stats["name"] == "file1.txt"
         assert stats["is_file"]
-        assert stats["size"] == 13
+        assert stats["size"] == 8
         assert "permissions" in stats
         assert "owner_readable" in stats
         assert "owner_writable" in stats
@@ -170,31 +176,17 @@ class TestFilesystemOperations:
         assert not result.ok
         assert result.error.code == "fs.access_denied"
     
+    @pytest.mark.skipif(os.name == 'nt', reason="symlinks need admin on Windows")
     def test_sandbox_protection_symlinks(self, temp_dir):
         """Test that symlinks don't bypass sandbox protection."""
         # Create a symlink pointing outside the sandbox
-        if os.name != 'nt':  # Skip on Windows
-            outside_file = Path(temp_dir).parent / "outside.txt"
-            outside_file.write_text("outside content")
-            
-            symlink = Path(temp_dir) / "link.txt"
-            symlink.symlink_to(outside_file)
-            
-            # Reading through symlink should be denied
-            result = read_file("link.txt", temp_dir)
-            assert not result.ok
-            assert result.error.code == "fs.access_denied"
-    
-    def test_write_file_append_mode(self, temp_dir):
-        """Test file write in append mode."""
-        # Write initial content
-        result = write_file("test.txt", "Hello", temp_dir)
-        assert result.ok
+        outside_file = Path(temp_dir).parent / "outside.txt"
+        outside_file.write_text("outside content")
         
-        # Append additional content
-        result = write_file("test.txt", ", World!", temp_dir, mode="a")
-        assert result.ok
+        symlink = Path(temp_dir) / "link.txt"
+        symlink.symlink_to(outside_file)
         
-        # Verify combined content
-        test_file = Path(temp_dir) / "test.txt"
-        assert test_file.read_text() == "Hello, World!"
+        # Reading through symlink should be denied
+        result = read_file("link.txt", temp_dir)
+        assert not result.ok
+        assert result.error.code == "fs.access_denied"
@@ -226,7 +226,7 @@ class TestLLMIntegration:
     """Test LLM integration in agent context."""
     
     @pytest.mark.asyncio
-    async def test_agent_llm_provider_initialization(self):
+    async def test_agent_llm_provider_initialization(self, redis_url):
         """Test that agent can initialize with LLM provider."""
         from ateam.agent.main import AgentApp
         
@@ -246,7 +246,7 @@ class TestLLMIntegration:
             
             # Initialize agent app
             app = AgentApp(
-                redis_url="redis://localhost:6379/0",
+                redis_url=f"{redis_url}/0",
                 cwd=temp_dir,
                 name_override="test",
                 project_override="test"
@@ -19,7 +19,7 @@ class TestOwnershipEnforcement:
         return mock_ownership
     
     @pytest.fixture
-    def agent_app_with_ownership(self, mock_ownership_manager):
+    def agent_app_with_ownership(self, mock_ownership_manager, redis_url):
         """Create an agent app with ownership manager."""
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create minimal .ateam config
@@ -50,7 +50,7 @@ prompt:
             
             # Create agent app
             app = AgentApp(
-                redis_url="redis://127.0.0.1:6379/0",
+                redis_url=f"{redis_url}/0",
                 cwd=temp_dir,
                 name_override="test-agent",
                 project_override="test-project"
@@ -318,7 +318,7 @@ class TestOwnershipEnforcementIntegration:
     """Integration tests for ownership enforcement."""
     
     @pytest.mark.asyncio
-    async def test_multiple_consoles_ownership_conflict(self):
+    async def test_multiple_consoles_ownership_conflict(self, redis_url):
         """Test that multiple consoles cannot perform mutating operations simultaneously."""
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create minimal .ateam config
@@ -349,7 +349,7 @@ prompt:
             
             # Create first agent app (owner)
             app1 = AgentApp(
-                redis_url="redis://127.0.0.1:6379/0",
+                redis_url=f"{redis_url}/0",
                 cwd=temp_dir,
                 name_override="test-agent",
                 project_override="test-project"
@@ -357,7 +357,7 @@ prompt:
             
             # Create second agent app (non-owner)
             app2 = AgentApp(
-                redis_url="redis://127.0.0.1:6379/0",
+                redis_url=f"{redis_url}/0",
                 cwd=temp_dir,
                 name_override="test-agent",
                 project_override="test-project"
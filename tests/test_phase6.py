@@ -105,6 +105,21 @@ class TestKBStorage:
         assert len(ids2) == 1
         assert ids2[0] == ids1[0]  # Should return existing ID
 
+    def test_add_after_delete_and_reload(self, storage, temp_dir):
+        """Test deduplication stays correct across delete and reload."""
+        collection_id = "test_collection"
+        item_id = storage.add(collection_id, "Some content")[0]
+        
+        # A reloaded storage dedupes against items persisted on disk
+        reloaded = KBStorage(temp_dir)
+        assert reloaded.add(collection_id, "Some content") == [item_id]
+        
+        # Deleted content can be added again as a new item
+        assert storage.delete(collection_id, item_id) is True
+        new_ids = storage.add(collection_id, "Some content")
+        assert new_ids != [item_id]
+        assert storage.add(collection_id, "Some content") == new_ids
+
     def test_list_items(self, storage):
         """Test listing items."""
         collection_id = "test_collection"
@@ -125,6 +125,24 @@ class TestPromptLayer:
         
         assert layer.get_base() == "# Updated Base"
         assert layer.get_overlay() == "Updated overlay"
+    
+    def test_reload_skips_unchanged_files(self):
+        """Test that reload only re-reads files that changed on disk."""
+        # Backdate the base so it is outside the just-modified window
+        os.utime(self.base_path, ns=(0, 1_000_000_000))
+        layer = PromptLayer(self.base_path, self.overlay_path)
+        
+        with open(self.overlay_path, 'w') as f:
+            f.write("Updated overlay")
+        
+        with patch("builtins.open", wraps=open) as mock_open:
+            result = layer.reload_from_disk()
+        assert result.ok is True
+        
+        opened = [call.args[0] for call in mock_open.call_args_list]
+        assert opened == [self.overlay_path]
+        assert layer.get_base() == "# Test Base Prompt\n\nYou are a helpful assistant."
+        assert layer.get_overlay() == "Updated overlay"
 
 
 class TestConsoleCommands:
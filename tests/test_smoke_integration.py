@@ -15,9 +15,9 @@ class TestSmokeIntegration:
     """Smoke test for agent registration and console listing."""
     
     @pytest.fixture
-    def redis_url(self):
+    def redis_url(self, redis_url):
         """Provide Redis URL for tests."""
-        return "redis://localhost:6379/0"
+        return f"{redis_url}/0"
     
     @pytest.fixture
     def dummy_agent_info(self):